@@ -21,6 +21,16 @@ from datetime import timedelta
 import time
 import logging
 import os
+from functools import lru_cache
+from excel_utils import EXCEL_ENGINE, normalize_key_columns, read_excel_with_fallback
+
+# Prefer xxHash for file fingerprints; fall back to blake2b from the standard library
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    import hashlib
+    XXHASH_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -48,6 +58,13 @@ logger.info(f"Data folder set to: {DATA_FOLDER.absolute()}")
 
 FILENAME_DATE_RE = re.compile(r'(\d{4}\d{2}\d{2})')  # matches YYYYMMDD
 DATE_FORMAT = "%Y%m%d"
+IDENTIFIER_COLUMNS = ["Sub Division", "Tehsil/Sub Tehsil", "Officer"]
+PENDENCY_COLUMNS = [
+    "Uncontested Pendency", "Income Certificate", "Copying Service",
+    "Inspection Records", "Overdue Mortgage", "Overdue Court Orders",
+    "Overdue Fardbadars"
+]
+TREND_X_MAX_TICKS = 15  # Daily x ticks until the date span would need more than this many labels
 
 # Initialize session state for settings persistence
 if "threshold_alert" not in st.session_state:
@@ -67,12 +84,14 @@ THRESHOLD_ALERT = st.session_state.threshold_alert
 
 # ---------- HELPERS ----------
 
+@lru_cache(maxsize=8192)
 def calculate_change(current, previous):
     """Calculate percentage change between two values"""
     if previous == 0:
         return 0 if current == 0 else 100
     return ((current - previous) / previous) * 100
 
+@lru_cache(maxsize=8192)
 def get_trend_icon(change):
     """Get trend indicator icon"""
     if change > 0:
@@ -82,6 +101,7 @@ def get_trend_icon(change):
     else:
         return "➡️"
 
+@lru_cache(maxsize=8192)
 def format_number(num):
     """Format number with commas"""
     try:
@@ -89,6 +109,26 @@ def format_number(num):
     except (ValueError, TypeError):
         return "0"
 
+def date_dtick(dates: pd.Series, max_ticks: int = TREND_X_MAX_TICKS) -> int:
+    """Whole-day x tick step (ms) for a trend chart: daily for short spans, widened to keep about max_ticks labels"""
+    span_days = max((dates.max() - dates.min()).days, 1) if len(dates) else 1
+    return -(-span_days // max_ticks) * 86400000
+
+def category_options(series: pd.Series) -> list:
+    """Sorted string options for a categorical filter column, read from its categories"""
+    return sorted(series.cat.categories.astype(str))
+
+def category_mask(series: pd.Series, selected) -> np.ndarray:
+    """Boolean row mask for a categorical column matching any of the selected string values"""
+    wanted_codes = np.flatnonzero(series.cat.categories.astype(str).isin(selected))
+    return np.isin(series.cat.codes.to_numpy(), wanted_codes)
+
+def _hash_bytes(buf) -> str:
+    """Fast 64-bit hex digest of a bytes buffer"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(buf)
+    return hashlib.blake2b(buf, digest_size=8).hexdigest()
+
 def validate_dataframe(df: pd.DataFrame, filename: str):
     """Validate that dataframe has required structure"""
     if df.empty:
@@ -124,11 +164,7 @@ def _load_all_files_uncached(folder_path: str) -> pd.DataFrame:
             continue
         
         try:
-            try:
-                df = pd.read_excel(f, engine="openpyxl")
-            except Exception as e:
-                logger.warning(f"Failed to read {f.name} with default sheet, trying first sheet: {e}")
-                df = pd.read_excel(f, sheet_name=0, engine="openpyxl")
+            df = read_excel_with_fallback(f)
             
             if df.empty:
                 logger.warning(f"File {f.name} is empty, skipping")
@@ -140,17 +176,8 @@ def _load_all_files_uncached(folder_path: str) -> pd.DataFrame:
                              "Inspection Records", "Overdue Mortgage", "Overdue Court Orders",
                              "Overdue Fardbadars"]
             
-            df_cols = {c.lower().strip(): c for c in df.columns}
-            
-            if "total" not in df_cols:
-                match = [c for c in df.columns if "total" in str(c).lower()]
-                if match:
-                    df.rename(columns={match[0]: "Total"}, inplace=True)
-            
-            if "sub division" not in df_cols:
-                match = [c for c in df.columns if "sub" in str(c).lower() and "division" in str(c).lower()]
-                if match:
-                    df.rename(columns={match[0]: "Sub Division"}, inplace=True)
+            # Map fuzzy Total / Sub Division headers onto the canonical names
+            df = normalize_key_columns(df)
             
             is_valid, error_msg = validate_dataframe(df, f.name)
             if not is_valid:
@@ -215,6 +242,12 @@ def _load_all_files_uncached(folder_path: str) -> pd.DataFrame:
         if col not in combined.columns:
             combined[col] = "Unknown"
     
+    # Identifier columns repeat across every daily file, so store them as categoricals once at load;
+    # filters, groupbys and nunique then work on integer codes
+    for col in IDENTIFIER_COLUMNS:
+        if col in combined.columns:
+            combined[col] = combined[col].astype("category")
+    
     if failed_files:
         logger.warning(f"Some files failed to load: {failed_files}")
     
@@ -249,12 +282,7 @@ def load_all_files(folder_path: str, cache_version: str = "v1") -> pd.DataFrame:
         
         try:
             # Try to read Excel file
-            try:
-                df = pd.read_excel(f, engine="openpyxl")
-            except Exception as e:
-                logger.warning(f"Failed to read {f.name} with default sheet, trying first sheet: {e}")
-                # Try first sheet fallback
-                df = pd.read_excel(f, sheet_name=0, engine="openpyxl")
+            df = read_excel_with_fallback(f)
             
             if df.empty:
                 logger.warning(f"File {f.name} is empty, skipping")
@@ -268,20 +296,8 @@ def load_all_files(folder_path: str, cache_version: str = "v1") -> pd.DataFrame:
                              "Inspection Records", "Overdue Mortgage", "Overdue Court Orders",
                              "Overdue Fardbadars"]
             
-            # If column names differ, try to map by fuzzy match: lower stripped
-            df_cols = {c.lower().strip(): c for c in df.columns}
-            
-            # Try to find and rename Total column
-            if "total" not in df_cols:
-                match = [c for c in df.columns if "total" in str(c).lower()]
-                if match:
-                    df.rename(columns={match[0]: "Total"}, inplace=True)
-            
-            # Try to find and rename Sub Division column
-            if "sub division" not in df_cols:
-                match = [c for c in df.columns if "sub" in str(c).lower() and "division" in str(c).lower()]
-                if match:
-                    df.rename(columns={match[0]: "Sub Division"}, inplace=True)
+            # Map fuzzy Total / Sub Division headers onto the canonical names
+            df = normalize_key_columns(df)
             
             # Validate dataframe
             is_valid, error_msg = validate_dataframe(df, f.name)
@@ -356,11 +372,62 @@ def load_all_files(folder_path: str, cache_version: str = "v1") -> pd.DataFrame:
         if col not in combined.columns:
             combined[col] = "Unknown"
     
+    # Identifier columns repeat across every daily file, so store them as categoricals once at load;
+    # filters, groupbys and nunique then work on integer codes
+    for col in IDENTIFIER_COLUMNS:
+        if col in combined.columns:
+            combined[col] = combined[col].astype("category")
+    
     if failed_files:
         logger.warning(f"Some files failed to load: {failed_files}")
     
     return combined
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def filter_options(_df: pd.DataFrame, data_key: tuple) -> dict:
+    """Sidebar option lists per filter column; _df is identified by data_key, so they only change when the inputs do"""
+    return {
+        col: category_options(_df[col])
+        for col in ("Sub Division", "Tehsil/Sub Tehsil", "Officer")
+        if col in _df.columns
+    }
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def aggregate_filtered(_df: pd.DataFrame, data_key: tuple, filter_key: tuple) -> dict:
+    """
+    The latest and previous snapshot dates, the overall per-date trend and the latest pendency sums
+    (in total and per sub-division) for a filtered frame.
+    _df is not hashed - data_key (which inputs were loaded) and filter_key (sidebar selections) identify it,
+    so widget interactions that leave the filters unchanged skip the aggregation.
+    """
+    agg_by_sub = _df.groupby(["__date", "Sub Division"], as_index=False, observed=True)["Total"].sum()
+    total_trend = agg_by_sub.groupby("__date", as_index=False, observed=True)["Total"].sum().sort_values("__date")
+    
+    # Sorted distinct dates: the latest and previous periods are its last two entries
+    snapshot_dates = pd.DatetimeIndex(_df["__date"].dropna().unique()).sort_values()
+    latest_date = snapshot_dates[-1] if len(snapshot_dates) > 0 else pd.NaT
+    previous_date = snapshot_dates[-2] if len(snapshot_dates) > 1 else None
+    
+    pendency_totals = {}
+    subdivision_pendency = pd.DataFrame()
+    pendency_cols = [col for col in PENDENCY_COLUMNS if col in _df.columns]
+    if pd.notna(latest_date) and pendency_cols:
+        latest = _df[_df["__date"] == latest_date]
+        # One column-wise reduction over the pendency block instead of a separate sum per column
+        sums = latest[pendency_cols].to_numpy().sum(axis=0, dtype=np.int64)
+        pendency_totals = dict(zip(pendency_cols, sums.tolist()))
+        # Pendency sums per sub-division in order of appearance, for the heatmap and the stacked breakdown
+        subdivision_pendency = latest.groupby("Sub Division", observed=True, sort=False)[pendency_cols].sum()
+        subdivision_pendency.index = subdivision_pendency.index.astype(object)
+    
+    return {
+        "latest_date": latest_date,
+        "previous_date": previous_date,
+        "total_trend": total_trend,
+        "pendency_totals": pendency_totals,
+        "subdivision_pendency": subdivision_pendency,
+    }
+
 # ---------- UI ----------
 # Official Professional Styling
 st.markdown("""
@@ -553,20 +620,25 @@ with col3:
 
 # Generate cache key based on files in folder to detect new files
 if DATA_FOLDER.exists():
-    files_in_folder = sorted([f.name for f in DATA_FOLDER.glob("*.xlsx") if not f.name.startswith("~$")])
-    # Use file names, modification times, and file sizes for cache key (more reliable detection)
+    # Use file names, modification times, and file sizes for cache key (more reliable detection).
+    # One scandir pass; DirEntry caches its stat, so each file is stat'ed once
     file_info = []
-    for f in DATA_FOLDER.glob("*.xlsx"):
-        if not f.name.startswith("~$"):
+    with os.scandir(DATA_FOLDER) as it:
+        for entry in it:
+            if not entry.name.endswith(".xlsx") or entry.name.startswith("~$"):
+                continue
             try:
-                stat = f.stat()
-                file_info.append((f.name, stat.st_mtime, stat.st_size))
+                stat = entry.stat()
+                file_info.append((entry.name, stat.st_mtime, stat.st_size))
             except Exception as e:
-                logger.warning(f"Could not get file stats for {f.name}: {e}")
-                file_info.append((f.name, 0, 0))
+                logger.warning(f"Could not get file stats for {entry.name}: {e}")
+                file_info.append((entry.name, 0, 0))
     # Sort by filename for consistent hashing
     file_info_sorted = tuple(sorted(file_info))
-    current_file_hash = str(hash(file_info_sorted))
+    # Stable content hash (Python's hash() is salted per process, so keys changed on every restart)
+    current_file_hash = _hash_bytes(
+        "\n".join(f"{name}\0{mtime}\0{size}" for name, mtime, size in file_info_sorted).encode("utf-8")
+    )
     # Also include file count for better detection
     current_file_hash = f"{current_file_hash}_{len(file_info)}"
     
@@ -601,6 +673,8 @@ elif files_changed:
 if refresh or st.session_state.get("force_uncached_load", False):
     # Clear cache first
     load_all_files.clear()
+    filter_options.clear()
+    aggregate_filtered.clear()
     # Use uncached version to get fresh data
     with st.spinner("Loading data (fresh reload)..."):
         df_all = _load_all_files_uncached(str(DATA_FOLDER))
@@ -662,8 +736,12 @@ else:
     date_range = st.sidebar.date_input("📅 Date range", value=None)
     st.sidebar.warning("⚠️ No valid dates found in files")
 
+# Option lists are cached per loaded dataset (folder, file fingerprint, cache version), not rebuilt every rerun
+data_key = (str(DATA_FOLDER), current_file_hash, st.session_state.cache_version)
+options_by_col = filter_options(df_all, data_key)
+
 # Sub Division filter
-subdivision_options = sorted(df_all["Sub Division"].dropna().unique().astype(str))
+subdivision_options = options_by_col["Sub Division"]
 selected_subdivisions = st.sidebar.multiselect(
     "🏢 Sub Division",
     options=subdivision_options,
@@ -673,7 +751,7 @@ selected_subdivisions = st.sidebar.multiselect(
 
 # Tehsil filter
 if "Tehsil/Sub Tehsil" in df_all.columns:
-    tehsil_options = sorted(df_all["Tehsil/Sub Tehsil"].dropna().unique().astype(str))
+    tehsil_options = options_by_col["Tehsil/Sub Tehsil"]
     selected_tehsils = st.sidebar.multiselect(
         "📍 Tehsil/Sub Tehsil",
         options=tehsil_options,
@@ -684,7 +762,7 @@ else:
     selected_tehsils = None
 
 # Officer filter
-officer_options = sorted(df_all["Officer"].dropna().unique().astype(str))
+officer_options = options_by_col["Officer"]
 selected_officers = st.sidebar.multiselect(
     "👤 Officer",
     options=officer_options,
@@ -713,41 +791,60 @@ st.sidebar.markdown(
     unsafe_allow_html=True
 )
 
-# Apply filters
-df = df_all.copy()
+# Apply filters: AND every active filter into one row mask and select once,
+# instead of materializing a new frame per filter
 filter_applied = False
+mask = np.ones(len(df_all), dtype=bool)
 
 if date_range and len(date_range) == 2:
     start, end = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
-    df = df[(df["__date"] >= start) & (df["__date"] <= end)]
+    dates = df_all["__date"].to_numpy()
+    mask &= (dates >= start.to_datetime64()) & (dates <= end.to_datetime64())
     filter_applied = True
 
 if selected_subdivisions:
-    df = df[df["Sub Division"].astype(str).isin(selected_subdivisions)]
+    mask &= category_mask(df_all["Sub Division"], selected_subdivisions)
     filter_applied = True
 
-if selected_tehsils and "Tehsil/Sub Tehsil" in df.columns:
-    df = df[df["Tehsil/Sub Tehsil"].astype(str).isin(selected_tehsils)]
+if selected_tehsils and "Tehsil/Sub Tehsil" in df_all.columns:
+    mask &= category_mask(df_all["Tehsil/Sub Tehsil"], selected_tehsils)
     filter_applied = True
 
 if selected_officers:
-    df = df[df["Officer"].astype(str).isin(selected_officers)]
+    mask &= category_mask(df_all["Officer"], selected_officers)
     filter_applied = True
 
+# Without an active filter df is just df_all; everything downstream only reads it
+df = df_all.loc[mask] if filter_applied else df_all
 
-# Aggregate for visuals
-agg_by_sub = df.groupby(["__date", "Sub Division"], as_index=False)["Total"].sum()
-latest_date = df["__date"].max()
+
+# Aggregate for visuals - cached per (loaded inputs, filter selections)
+filter_key = (
+    tuple(date_range) if date_range else (),
+    tuple(selected_subdivisions or ()),
+    tuple(selected_tehsils or ()),
+    tuple(selected_officers or ()),
+)
+aggregates = aggregate_filtered(df, data_key, filter_key)
+latest_date = aggregates["latest_date"]
 latest_snapshot = df[df["__date"] == latest_date].copy() if pd.notna(latest_date) else pd.DataFrame()
 
-# Calculate previous period for comparison
-previous_date = None
-previous_snapshot = pd.DataFrame()
-if not df.empty and pd.notna(latest_date):
-    previous_date_options = df[df["__date"] < latest_date]["__date"].unique()
-    if len(previous_date_options) > 0:
-        previous_date = pd.to_datetime(previous_date_options.max())
-        previous_snapshot = df[df["__date"] == previous_date].copy()
+# Previous period for comparison comes from the same cached date list, not another scan of df
+previous_date = aggregates["previous_date"]
+previous_snapshot = df[df["__date"] == previous_date].copy() if previous_date is not None else pd.DataFrame()
+
+# Snapshot summary shared by both tabs, computed once per rerun: one groupby gives the per-sub-division
+# totals, and its length is the sub-division count
+total_latest = int(latest_snapshot["Total"].sum()) if not latest_snapshot.empty else 0
+total_previous = int(previous_snapshot["Total"].sum()) if not previous_snapshot.empty else 0
+total_change = calculate_change(total_latest, total_previous)
+if not latest_snapshot.empty:
+    snapshot_grouped = latest_snapshot.groupby("Sub Division", as_index=False, observed=True)["Total"].sum().sort_values("Total", ascending=False)
+    num_subdivisions = len(snapshot_grouped)
+    num_officers = latest_snapshot["Officer"].nunique()
+else:
+    snapshot_grouped = pd.DataFrame(columns=["Sub Division", "Total"])
+    num_subdivisions = num_officers = 0
 
 # Create tabs
 tab1, tab2 = st.tabs(["📊 Executive Dashboard", "📈 Summary View"])
@@ -760,16 +857,9 @@ with tab1:
         st.warning("No data available for the selected date range/filters.")
     else:
         # Calculate key metrics
-        total_latest = int(latest_snapshot["Total"].sum())
-        total_previous = int(previous_snapshot["Total"].sum()) if not previous_snapshot.empty else 0
-        total_change = calculate_change(total_latest, total_previous)
-        
-        num_subdivisions = latest_snapshot["Sub Division"].nunique()
-        num_officers = latest_snapshot["Officer"].nunique()
         avg_per_subdivision = total_latest / num_subdivisions if num_subdivisions > 0 else 0
         
         # Top 3 sub-divisions
-        snapshot_grouped = latest_snapshot.groupby("Sub Division", as_index=False)["Total"].sum().sort_values("Total", ascending=False)
         top3_subdivisions = snapshot_grouped.head(3)
         
         # Alerts
@@ -783,9 +873,7 @@ with tab1:
             "Overdue Fardbadars"
         ]
         available_pendency_cols = [col for col in pendency_columns if col in latest_snapshot.columns]
-        pendency_totals = {}
-        for col in available_pendency_cols:
-            pendency_totals[col] = int(latest_snapshot[col].sum())
+        pendency_totals = aggregates["pendency_totals"]
         top_pendency_type = max(pendency_totals.items(), key=lambda x: x[1]) if pendency_totals else ("N/A", 0)
         
         # Key Metrics Row - Clean
@@ -981,7 +1069,7 @@ with tab1:
             
             # Top alert sub-division - clear styling
             if not alert_df.empty:
-                top_alert = alert_df.groupby("Sub Division", as_index=False)["Total"].sum().sort_values("Total", ascending=False).head(1)
+                top_alert = alert_df.groupby("Sub Division", as_index=False, observed=True)["Total"].sum().sort_values("Total", ascending=False).head(1)
                 if not top_alert.empty:
                     st.markdown(f"<p style='font-weight: 600; color: #003366; margin: 0.5rem 0;'>Highest Alert:</p>", unsafe_allow_html=True)
                     st.markdown(f"<p style='font-size: 1rem; font-weight: 600; color: #333; margin: 0.5rem 0;'>{top_alert.iloc[0]['Sub Division']}</p>", unsafe_allow_html=True)
@@ -1001,18 +1089,17 @@ with tab1:
         
         with col_viz1:
             st.markdown("### 📈 Trend Overview")
-            total_trend = agg_by_sub.groupby("__date", as_index=False)["Total"].sum().sort_values("__date")
+            total_trend = aggregates["total_trend"]
             if not total_trend.empty and len(total_trend) > 1:
                 fig_trend = px.line(
                     total_trend, x="__date", y="Total", markers=True,
                     title="District Total Trend",
                     color_discrete_sequence=['#1f77b4']
                 )
-                fig_trend.add_scatter(
-                    x=total_trend["__date"], y=total_trend["Total"],
-                    mode='lines+markers', name='Trend',
-                    line=dict(width=3, color='#1f77b4'),
-                    marker=dict(size=8, color='#1f77b4')
+                fig_trend.update_traces(
+                    name='Trend',
+                    line=dict(width=3),
+                    marker=dict(size=8)
                 )
                 fig_trend.update_layout(
                     height=300,
@@ -1022,7 +1109,7 @@ with tab1:
                     plot_bgcolor='rgba(0,0,0,0)',
                     paper_bgcolor='rgba(0,0,0,0)',
                     xaxis=dict(
-                        dtick=86400000,  # Daily scale (milliseconds in a day)
+                        dtick=date_dtick(total_trend["__date"]),  # Daily, widened on long ranges
                         tickformat="%Y-%m-%d",  # Date format
                         tickmode="linear",
                         gridcolor='rgba(128,128,128,0.2)'
@@ -1063,18 +1150,10 @@ with tab1:
         # Heatmap: Sub Division vs Pendency Types
         if available_pendency_cols and not latest_snapshot.empty:
             st.markdown("### 🔥 Heatmap: Sub Division vs Pendency Types")
-            heatmap_data = []
-            for subdiv in latest_snapshot["Sub Division"].dropna().unique()[:15]:  # Top 15
-                subdiv_df = latest_snapshot[latest_snapshot["Sub Division"] == subdiv]
-                row = {"Sub Division": subdiv}
-                for pcol in available_pendency_cols:
-                    row[pcol] = int(subdiv_df[pcol].sum())
-                heatmap_data.append(row)
+            # First 15 sub-divisions from the cached per-sub-division sums, not a filter-and-sum per cell
+            heatmap_df = aggregates["subdivision_pendency"].head(15)
             
-            if heatmap_data:
-                heatmap_df = pd.DataFrame(heatmap_data)
-                heatmap_df = heatmap_df.set_index("Sub Division")
-                
+            if not heatmap_df.empty:
                 # Create heatmap with better color contrast
                 fig_heatmap = px.imshow(
                     heatmap_df.T,
@@ -1095,26 +1174,32 @@ with tab1:
                 
                 # Add expandable section with officer details
                 with st.expander("📋 View Officers Responsible for Each Sub-Division and Pendency Type"):
-                    officer_details = []
-                    for subdiv in latest_snapshot["Sub Division"].dropna().unique()[:15]:
-                        subdiv_df = latest_snapshot[latest_snapshot["Sub Division"] == subdiv]
-                        for pcol in available_pendency_cols:
-                            officers_with_pendency = subdiv_df[subdiv_df[pcol] > 0]
-                            if not officers_with_pendency.empty:
-                                for _, row in officers_with_pendency.iterrows():
-                                    officer_details.append({
-                                        "Pendency Type": pcol,
-                                        "Officer": row["Officer"],
-                                        "Tehsil/Sub Tehsil": row.get("Tehsil/Sub Tehsil", "N/A") if pd.notna(row.get("Tehsil/Sub Tehsil", None)) else "N/A",
-                                        "Count": int(row[pcol])
-                                    })
+                    # Reshape the first 15 sub-divisions to one row per (officer, pendency type) and keep the non-zero counts
+                    subdiv_rank, _ = pd.factorize(latest_snapshot["Sub Division"])
+                    in_heatmap = (subdiv_rank >= 0) & (subdiv_rank < 15)
+                    officer_rows = pd.DataFrame({
+                        "Tehsil/Sub Tehsil": (
+                            latest_snapshot["Tehsil/Sub Tehsil"].astype(object).fillna("N/A")
+                            if "Tehsil/Sub Tehsil" in latest_snapshot.columns else "N/A"
+                        ),
+                        "Officer": latest_snapshot["Officer"].astype(object),
+                        "__subdiv_rank": subdiv_rank,
+                    }).join(latest_snapshot[available_pendency_cols])[in_heatmap]
+                    details_df = officer_rows.melt(
+                        id_vars=["Tehsil/Sub Tehsil", "Officer", "__subdiv_rank"],
+                        value_vars=available_pendency_cols,
+                        var_name="Pendency Type",
+                        value_name="Count"
+                    )
+                    details_df = details_df[details_df["Count"] > 0]
                     
-                    if officer_details:
-                        details_df = pd.DataFrame(officer_details)
-                        # Reorder columns: Tehsil first, then Pendency Type, Officer, Count
+                    if not details_df.empty:
+                        # Sort by Pendency Type and Count; ties keep sub-division order, then row order
+                        details_df = details_df.sort_values(
+                            ["Pendency Type", "Count", "__subdiv_rank"], ascending=[True, False, True], kind="stable"
+                        )
+                        # Columns: Tehsil first, then Pendency Type, Officer, Count
                         details_df = details_df[["Tehsil/Sub Tehsil", "Pendency Type", "Officer", "Count"]]
-                        # Sort by Pendency Type and Count
-                        details_df = details_df.sort_values(["Pendency Type", "Count"], ascending=[True, False])
                         st.dataframe(details_df, width='stretch', hide_index=True, height=400)
                     else:
                         st.info("No officer details available")
@@ -1156,9 +1241,6 @@ with tab1:
 with tab2:
     st.markdown("## 📈 Total Pendency Summary")
     
-    # Group by Sub Division for charts
-    snapshot_grouped = latest_snapshot.groupby("Sub Division", as_index=False)["Total"].sum().sort_values("Total", ascending=False)
-
     # Layout: Left charts, right KPIs
     left, right = st.columns([3,1])
 
@@ -1191,7 +1273,7 @@ with tab2:
         # Trend
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("### 📈 District Total Trend")
-        total_trend = agg_by_sub.groupby("__date", as_index=False)["Total"].sum().sort_values("__date")
+        total_trend = aggregates["total_trend"]
         if not total_trend.empty:
             fig_line = px.line(
                 total_trend, x="__date", y="Total", markers=True,
@@ -1209,7 +1291,7 @@ with tab2:
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)',
                 xaxis=dict(
-                    dtick=86400000,  # Daily scale (milliseconds in a day)
+                    dtick=date_dtick(total_trend["__date"]),  # Daily, widened on long ranges
                     tickformat="%Y-%m-%d",  # Date format
                     tickmode="linear",
                     gridcolor='rgba(128,128,128,0.2)'
@@ -1234,16 +1316,9 @@ with tab2:
         
         if available_pendency_cols and not latest_snapshot.empty:
             # Prepare data for stacked bar chart
-            breakdown_data = []
-            for subdiv in latest_snapshot["Sub Division"].dropna().unique():
-                subdiv_df = latest_snapshot[latest_snapshot["Sub Division"] == subdiv]
-                row = {"Sub Division": subdiv}
-                for pcol in available_pendency_cols:
-                    row[pcol] = int(subdiv_df[pcol].sum())
-                breakdown_data.append(row)
+            breakdown_df = aggregates["subdivision_pendency"].reset_index()
             
-            if breakdown_data:
-                breakdown_df = pd.DataFrame(breakdown_data)
+            if not breakdown_df.empty:
                 # Sort by total pendency (descending)
                 breakdown_df["Total"] = breakdown_df[available_pendency_cols].sum(axis=1)
                 breakdown_df = breakdown_df.sort_values("Total", ascending=False).head(15)  # Top 15
@@ -1276,9 +1351,6 @@ with tab2:
 
     with right:
         st.markdown("### 📊 Key Metrics")
-        total_latest = int(latest_snapshot["Total"].sum()) if not latest_snapshot.empty else 0
-        total_previous = int(previous_snapshot["Total"].sum()) if not previous_snapshot.empty else 0
-        total_change = calculate_change(total_latest, total_previous)
         
         # Metrics with trends
         delta_text = f"{total_change:+.1f}%" if previous_date else None
@@ -1287,8 +1359,8 @@ with tab2:
         if previous_date:
             st.caption(f"vs {previous_date.strftime('%b %d')}")
         
-        st.metric("Sub Divisions", latest_snapshot["Sub Division"].nunique())
-        st.metric("Officers", latest_snapshot["Officer"].nunique())
+        st.metric("Sub Divisions", num_subdivisions)
+        st.metric("Officers", num_officers)
         
         # Alerts
         st.markdown("<br>", unsafe_allow_html=True)
@@ -1298,7 +1370,7 @@ with tab2:
             num_alerts = alert_df["Sub Division"].nunique()
             st.metric("Alerts", num_alerts, delta=f"Above {threshold}", delta_color="inverse")
             # show top 5 alerts with percentage
-            alerts = alert_df.groupby("Sub Division", as_index=False)["Total"].sum().sort_values("Total", ascending=False).head(5)
+            alerts = alert_df.groupby("Sub Division", as_index=False, observed=True)["Total"].sum().sort_values("Total", ascending=False).head(5)
             alerts["% of Total"] = (alerts["Total"] / total_latest * 100).round(1)
             alerts["Above Threshold"] = alerts["Total"] - threshold
             display_alerts = alerts[["Sub Division", "Total", "% of Total", "Above Threshold"]]
@@ -1311,8 +1383,6 @@ with tab2:
     st.markdown("### 📋 Complete Summary Table")
     
     if not latest_snapshot.empty:
-        total_latest = int(latest_snapshot["Total"].sum())
-        
         # Create comprehensive summary table
         summary_table = latest_snapshot.copy()
         
@@ -1362,7 +1432,8 @@ with tab2:
         final_table_display = final_table.copy()
         for col in available_pendency_cols + ["Total"]:
             if col in final_table_display.columns:
-                final_table_display[col] = final_table_display[col].apply(format_number)
+                # Counts repeat heavily across rows, so the memoized formatter mostly returns cached labels
+                final_table_display[col] = final_table_display[col].map(format_number)
         
         # Format percentage
         if "% of Total" in final_table_display.columns:
@@ -1379,24 +1450,25 @@ with tab2:
             height=400
         )
         
-        # Download buttons
+        # Download buttons. CSVs are built only when a button is clicked (callable data), not on every rerun,
+        # and on_click="ignore" keeps the click from rerunning the whole script
         col_download1, col_download2 = st.columns(2)
         with col_download1:
-            csv_formatted = final_table_display.to_csv(index=False).encode('utf-8')
             st.download_button(
                 "📥 Download Formatted Table (CSV)",
-                data=csv_formatted,
+                data=lambda: final_table_display.to_csv(index=False).encode('utf-8'),
                 file_name=f"fcr_summary_{latest_date.strftime('%Y%m%d')}.csv",
                 mime="text/csv",
+                on_click="ignore",
                 width='stretch'
             )
         with col_download2:
-            csv_raw = final_table.to_csv(index=False).encode('utf-8')
             st.download_button(
                 "📥 Download Raw Data (CSV)",
-                data=csv_raw,
+                data=lambda: final_table.to_csv(index=False).encode('utf-8'),
                 file_name=f"fcr_raw_{latest_date.strftime('%Y%m%d')}.csv",
                 mime="text/csv",
+                on_click="ignore",
                 width='stretch'
             )
         
@@ -1405,8 +1477,13 @@ with tab2:
 
     # Download full combined history
     st.subheader("Download Full Historical Data")
-    hist_csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button("Download full history CSV", data=hist_csv, file_name="fcr_history.csv")
+    st.download_button(
+        "Download full history CSV",
+        data=lambda: df.to_csv(index=False).encode("utf-8"),
+        file_name="fcr_history.csv",
+        mime="text/csv",
+        on_click="ignore",
+    )
 
 
 # Footer - simplified
@@ -12,16 +12,21 @@ Reads cleaned daily Excel files from Google Drive or local folder and shows:
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
+import openpyxl
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from pathlib import Path
 import re
 from datetime import timedelta
 import time
+import threading
 import logging
 import os
 from io import BytesIO
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from excel_utils import CALAMINE_AVAILABLE
 
 # Try to import Google Drive storage
 try:
@@ -32,6 +37,14 @@ except Exception as e:
     logger = logging.getLogger(__name__)
     logger.warning(f"Google Drive not available: {e}")
 
+# Prefer xxHash for file fingerprints; fall back to blake2b from the standard library
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    import hashlib
+    XXHASH_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -51,6 +64,124 @@ st.set_page_config(
 DATA_FOLDER = Path("data")  # Local fallback folder
 FILENAME_DATE_RE = re.compile(r'(\d{4}\d{2}\d{2})')  # matches YYYYMMDD
 DATE_FORMAT = "%Y%m%d"
+# Accepted workbook formats. Binary .xlsb exports parse several times faster than .xlsx
+# and are the recommended upstream format; .xls/.xlsb need python-calamine to be installed.
+LOCAL_EXCEL_EXTENSIONS = (".xlsx", ".xlsb")
+DRIVE_EXCEL_EXTENSIONS = (".xlsx", ".xls", ".xlsb")
+TOTAL_COL_RE = re.compile(r'total', re.IGNORECASE)  # fuzzy Total header
+SUBDIV_COL_RE = re.compile(r'^(?=.*sub)(?=.*division)', re.IGNORECASE | re.DOTALL)  # fuzzy Sub Division header
+ALIAS_STRIP_RE = re.compile(r'[\s_\-]')
+PENDENCY_COLUMNS = [
+    "Uncontested Pendency", "Income Certificate", "Copying Service",
+    "Inspection Records", "Overdue Mortgage", "Overdue Court Orders",
+    "Overdue Fardbadars"
+]
+# Columns read from each workbook; anything else is skipped by the parser
+KEEP_COLUMNS = {
+    "Officer", "Sub Division", "SubDivision", "Tehsil/Sub Tehsil",
+    "Rank", "Total", "TOTAL", *PENDENCY_COLUMNS
+}
+# Text identifier columns: Arrow-backed strings per file, categoricals once combined
+IDENTIFIER_COLUMNS = ["Sub Division", "Tehsil/Sub Tehsil", "Officer"]
+# Column order every per-file frame is aligned to before concatenation
+CANONICAL_COLUMNS = [
+    "Sub Division", "Tehsil/Sub Tehsil", "Officer", "Rank",
+    *PENDENCY_COLUMNS, "Total", "__source_file"
+]
+# Upper bound on points per officer sparkline, which spans the whole history (LTTB-downsampled beyond this)
+SPARKLINE_MAX_POINTS = 60
+# Trend chart y axis: keep the original 200 step until it would draw more than this many ticks
+TREND_Y_MIN_DTICK = 200
+TREND_Y_MAX_TICKS = 25
+# Canonical names for known header spellings, keyed by lowercased name without spaces/underscores/hyphens
+COLUMN_ALIAS = {
+    "total": "Total",
+    "subdivision": "Sub Division",
+}
+PARQUET_CACHE_DIR = DATA_FOLDER / ".cache"  # Parsed workbooks: Drive files by id + modifiedTime, local files by path + mtime + size
+PARQUET_CACHE_MAX_FILES = 30
+# Schema version of the parsed frames in the parquet cache, part of every cache filename. Bump it whenever
+# what _ingest_one stores changes (columns, dtypes, normalization), so frames written by older code are not reused
+PARQUET_CACHE_VERSION = 1
+PARQUET_CACHE_PREFIX = f"v{PARQUET_CACHE_VERSION}_"
+LOCAL_PREFETCH_MIN_FILES = 16  # local folders larger than this read workbooks ahead of the parsers
+LOCAL_PREFETCH_WORKERS = 8
+PREFETCH_WINDOW = 8  # at most this many fetched-but-unparsed files are held in memory
+INLINE_INGEST_MAX_FILES = 2  # at most this many files to parse: skip the thread pools and ingest inline
+
+# Pendency card colors, light to dark (YlOrRd scale); a card's level is its share of the total in 15% steps
+PENDENCY_CARD_COLORS = np.array(['#ffffcc', '#ffeda0', '#fed976', '#feb24c', '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026', '#800026'])
+PENDENCY_CARD_GRADIENT_END = PENDENCY_CARD_COLORS[np.minimum(np.arange(len(PENDENCY_CARD_COLORS)) + 1, len(PENDENCY_CARD_COLORS) - 1)]
+PENDENCY_CARD_BORDER = PENDENCY_CARD_COLORS[np.minimum(np.arange(len(PENDENCY_CARD_COLORS)) + 2, len(PENDENCY_CARD_COLORS) - 1)]
+PENDENCY_CARD_TEXT = np.where(np.arange(len(PENDENCY_CARD_COLORS)) < 4, '#000000', '#ffffff')
+PENDENCY_CARD_HTML = (
+    '<div style="background: linear-gradient(135deg, {bg} 0%, {bg_end} 100%); padding: 0.6rem 0.8rem; border-radius: 6px; '
+    'border-left: 3px solid {border}; box-shadow: 0 1px 3px rgba(0,0,0,0.1); margin-bottom: 0.5rem;">'
+    '<h4 style="color: {text}; margin: 0 0 0.3rem 0; font-size: 0.8rem; font-weight: 600; line-height: 1.2;">{label}</h4>'
+    '<p style="color: {text}; margin: 0; font-size: 1.2rem; font-weight: 700; line-height: 1.2;">{value}</p>'
+    '<p style="color: {text}; margin: 0.15rem 0 0 0; font-size: 0.75rem; opacity: 0.9; line-height: 1.2;">{pct:.1f}%</p>'
+    '</div>'
+)
+
+# Top 3 sub-division rows: name, total and change on the left, progress bar on the right
+TOP_SUBDIVISION_ROW_HTML = (
+    "<div style='display: flex; align-items: flex-start; gap: 1rem;'>"
+    "<div style='flex: 3;'>"
+    "<p style='font-weight: 600; color: #003366; margin: 0.25rem 0; font-size: 1rem;'>{subdiv}</p>"
+    "<p style='font-size: 1rem; color: #333; margin: 0.25rem 0;'><strong>{total}</strong> <span style='color: #666; font-size: 0.85rem;'>({pct:.1f}% of total)</span></p>"
+    "{change}"
+    "</div>"
+    "<div style='flex: 2;'>"
+    "<div style='width: 100%; height: 1.5rem; background-color: #e0e0e0; border-radius: 0.25rem; overflow: hidden; margin-top: 0.5rem;'>"
+    "<div style='width: {bar_pct}%; height: 100%; background-color: {bar_color}; transition: width 0.3s ease;'></div>"
+    "</div>"
+    "</div>"
+    "</div>"
+)
+TOP_SUBDIVISION_CHANGE_HTML = "<p style='color: {color}; font-size: 0.85rem; margin: 0.25rem 0;'>{icon} {change:+.1f}% vs previous</p>"
+TOP_OFFICER_ROW_HTML = (
+    "<div style='display: flex; align-items: flex-start; gap: 1rem;'>"
+    "<div style='flex: 3;'>"
+    "<p style='font-size: 0.95rem; font-weight: 600; color: #003366; margin: 0.25rem 0;'><strong>{subdiv}</strong> - <strong>{tehsil}</strong> - <strong>{officer}</strong></p>"
+    "<p style='font-size: 1rem; color: #333; margin: 0.25rem 0;'><strong>{total}</strong> <span style='color: #666; font-size: 0.85rem;'>({pct:.1f}% of total)</span></p>"
+    "</div>"
+    "<div style='flex: 2;'>{trend}</div>"
+    "</div>"
+)
+TOP_OFFICER_BAR_HTML = (
+    "<div style='width: 100%; height: 1.5rem; background-color: #e0e0e0; border-radius: 0.25rem; overflow: hidden; margin-top: 0.5rem;'>"
+    "<div style='width: {bar_pct}%; height: 100%; background-color: {bar_color}; transition: width 0.3s ease;'></div>"
+    "</div>"
+)
+
+# Static page fragments
+HEADER_HTML = (
+    '<div style="background: linear-gradient(135deg, #003366 0%, #0066cc 100%); padding: 1.5rem 2rem; margin-bottom: 1.5rem; border-radius: 8px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">'
+    '<h1 style="color: #ffffff; margin: 0; padding: 0; border: none; font-size: 2rem; font-weight: 700; letter-spacing: 0.5px;">FCR Daily Dashboard</h1>'
+    '</div>'
+)
+DEVELOPER_HTML = (
+    "<div style='text-align: center; padding: 15px 0;'>"
+    "<p style='margin: 0; color: #666; font-size: 0.85em; line-height: 1.5;'>"
+    "Developed by<br>"
+    "<strong style='color: #1f77b4; font-size: 1.1em;'>Shivam Gulati</strong><br>"
+    "<span style='font-size: 0.8em;'>Land Revenue Fellow</span>"
+    "</p>"
+    "<div style='margin-top: 15px; padding-top: 15px; border-top: 1px solid #e0e0e0;'>"
+    "<p style='margin: 0 0 10px 0; color: #666; font-size: 0.75em; font-weight: 600; text-align: center;'>In case of Glitches</p>"
+    "<div style='display: flex; flex-direction: column; gap: 8px; align-items: center; justify-content: center;'>"
+    "<div style='display: flex; align-items: center; justify-content: center; gap: 8px;'>"
+    "<span style='font-size: 1em;'>📧</span>"
+    "<a href='mailto:Shivamgulati137@gmail.com' style='color: #1f77b4; text-decoration: none; font-size: 0.75em; word-break: break-word;'>Shivamgulati137@gmail.com</a>"
+    "</div>"
+    "<div style='display: flex; align-items: center; justify-content: center; gap: 8px;'>"
+    "<span style='font-size: 1em;'>📱</span>"
+    "<span style='color: #666; font-size: 0.75em;'>62844-12362</span>"
+    "</div>"
+    "</div>"
+    "</div>"
+    "</div>"
+)
 
 # Initialize Google Drive storage if configured
 storage = None
@@ -84,19 +215,21 @@ if "last_refresh_time" not in st.session_state:
     st.session_state.last_refresh_time = None
 if "last_file_hash" not in st.session_state:
     st.session_state.last_file_hash = None
-if "pending_file_update" not in st.session_state:
-    st.session_state.pending_file_update = False
+if "last_cheap_sig" not in st.session_state:
+    st.session_state.last_cheap_sig = None
 if "refresh_requested" not in st.session_state:
     st.session_state.refresh_requested = False
 
 # ---------- HELPERS ----------
 
+@lru_cache(maxsize=2048)
 def calculate_change(current, previous):
     """Calculate percentage change between two values"""
     if previous == 0:
         return 0 if current == 0 else 100
     return ((current - previous) / previous) * 100
 
+@lru_cache(maxsize=2048)
 def get_trend_icon(change):
     """Get trend indicator icon"""
     if change > 0:
@@ -106,6 +239,7 @@ def get_trend_icon(change):
     else:
         return "➡️"
 
+@lru_cache(maxsize=8192)
 def format_number(num):
     """Format number with commas"""
     try:
@@ -113,6 +247,77 @@ def format_number(num):
     except (ValueError, TypeError):
         return "0"
 
+def nice_dtick(max_value: float, max_ticks: int = TREND_Y_MAX_TICKS, min_step: float = TREND_Y_MIN_DTICK) -> float:
+    """Axis tick step: min_step while it gives at most max_ticks ticks from zero to max_value,
+    otherwise the smallest whole-number 1-2-5 step that does"""
+    raw_step = max(float(max_value) / max_ticks, 1.0)
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    return max(float(min_step), float(magnitude * next(m for m in (1, 2, 5, 10) if m * magnitude >= raw_step)))
+
+def sparkline_svg(x: np.ndarray, y: np.ndarray, color: str, height: int = 100) -> str:
+    """Inline SVG sparkline (line plus point markers, y axis from zero) for a small series"""
+    x = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    pad = 8.0
+    x_span = x.max() - x.min()
+    xs = pad + (x - x.min()) / x_span * (100 - 2 * pad) if x_span > 0 else np.full(len(x), 50.0)
+    y_max = y.max()
+    ys = (100 - pad) - (y / y_max * (100 - 2 * pad) if y_max > 0 else np.zeros(len(y)))
+    points = " ".join(f"{a:.2f},{b:.2f}" for a, b in zip(xs.tolist(), ys.tolist()))
+    # Zero-length segments with round caps draw the markers; non-scaling strokes keep them round when stretched
+    dots = " ".join(f"M{a:.2f} {b:.2f}h0" for a, b in zip(xs.tolist(), ys.tolist()))
+    return (
+        f"<svg viewBox='0 0 100 100' preserveAspectRatio='none' width='100%' height='{height}' style='display: block;'>"
+        f"<polyline points='{points}' fill='none' stroke='{color}' stroke-width='2' stroke-linejoin='round' vector-effect='non-scaling-stroke'/>"
+        f"<path d='{dots}' stroke='{color}' stroke-width='5' stroke-linecap='round' vector-effect='non-scaling-stroke'/>"
+        "</svg>"
+    )
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int):
+    """Largest-Triangle-Three-Buckets downsampling. Returns (x, y) with at most n_out points,
+    keeping the first and last points and the visually significant peaks in between."""
+    n = len(x)
+    if n_out < 3 or n <= n_out:
+        return x, y
+    if np.issubdtype(x.dtype, np.datetime64):
+        xf = x.astype("datetime64[ns]").astype("int64").astype("float64")
+    else:
+        xf = x.astype("float64")
+    yf = y.astype("float64")
+    
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average point of the next bucket (the last point for the final bucket)
+        if i + 2 < len(edges):
+            avg_x = xf[end:edges[i + 2]].mean()
+            avg_y = yf[end:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = xf[-1], yf[-1]
+        area = np.abs((xf[a] - avg_x) * (yf[start:end] - yf[a]) - (xf[a] - xf[start:end]) * (avg_y - yf[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+def category_options(series: pd.Series) -> list:
+    """Sorted string options for a categorical filter column, read from its categories"""
+    return sorted(series.cat.categories.astype(str))
+
+def category_mask(series: pd.Series, selected) -> np.ndarray:
+    """Boolean row mask for a categorical column matching any of the selected string values"""
+    wanted_codes = np.flatnonzero(series.cat.categories.astype(str).isin(selected))
+    return np.isin(series.cat.codes.to_numpy(), wanted_codes)
+
+def rank_and_alert(totals: np.ndarray, threshold: float):
+    """Dense descending rank (int32) and over-threshold flags for a totals array in one pass"""
+    _, inverse = np.unique(-totals, return_inverse=True)
+    return (inverse + 1).astype(np.int32), totals > threshold
+
 def validate_dataframe(df: pd.DataFrame, filename: str):
     """Validate that dataframe has required structure"""
     if df.empty:
@@ -125,6 +330,259 @@ def validate_dataframe(df: pd.DataFrame, filename: str):
     
     return True, "OK"
 
+def _alias_key(col) -> str:
+    """Lookup key for COLUMN_ALIAS"""
+    return ALIAS_STRIP_RE.sub('', str(col).lower())
+
+def _normalize_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip column names and rename known aliases to their canonical names"""
+    df = df.rename(columns=lambda c: COLUMN_ALIAS.get(_alias_key(c), c.strip() if isinstance(c, str) else c))
+    
+    # Fall back to fuzzy matching for headers that are not a known alias
+    if "Total" not in df.columns:
+        match = next((c for c in df.columns if TOTAL_COL_RE.search(str(c))), None)
+        if match is not None:
+            df = df.rename(columns={match: "Total"})
+    if "Sub Division" not in df.columns:
+        match = next((c for c in df.columns if SUBDIV_COL_RE.search(str(c))), None)
+        if match is not None:
+            df = df.rename(columns={match: "Sub Division"})
+    return df
+
+def _to_canonical(df: pd.DataFrame) -> pd.DataFrame:
+    """Select the canonical columns present in df, in CANONICAL_COLUMNS order"""
+    return df[[c for c in CANONICAL_COLUMNS if c in df.columns]]
+
+def _keep_column(col) -> bool:
+    """usecols filter: keep the columns the dashboard uses, including fuzzy Total/Sub Division headers"""
+    name = str(col).strip()
+    return name in KEEP_COLUMNS or bool(TOTAL_COL_RE.search(name) or SUBDIV_COL_RE.search(name))
+
+def _coerce_counts(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    """int32 block for count columns: text is parsed with to_numeric, blanks and junk become 0"""
+    block = df[cols]
+    # Columns that calamine or the parquet cache already typed as numbers skip the per-value parse
+    text_cols = [col for col in cols if not pd.api.types.is_numeric_dtype(block[col])]
+    if text_cols:
+        block = block.assign(**{col: pd.to_numeric(block[col], errors="coerce") for col in text_cols})
+    return block.fillna(0).astype("int32")
+
+def _read_excel_fast(source) -> pd.DataFrame:
+    """Read the first worksheet of an Excel file with calamine, or openpyxl in read-only mode"""
+    if CALAMINE_AVAILABLE:
+        return pd.read_excel(source, sheet_name=0, engine="calamine", usecols=_keep_column)
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = [c if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+        df = pd.DataFrame(list(rows), columns=columns)
+        df = df.loc[:, [_keep_column(c) for c in columns]]
+    finally:
+        wb.close()
+    # Match pd.read_excel, which skips fully blank rows
+    return df.dropna(how="all").reset_index(drop=True)
+
+def _drive_cache_path(drive_file: dict):
+    """Parquet cache path for a Drive file, or None if it has no id/modifiedTime"""
+    file_id = drive_file.get('id', '')
+    modified = re.sub(r'[^0-9A-Za-z]', '', str(drive_file.get('modifiedTime', '')))
+    if not file_id or not modified:
+        return None
+    return PARQUET_CACHE_DIR / f"{PARQUET_CACHE_PREFIX}{file_id}_{modified}.parquet"
+
+def _local_cache_path(path: Path, stat: os.stat_result) -> Path:
+    """Parquet cache path for a local workbook revision, keyed by its absolute path, mtime and size"""
+    path_key = _hash_bytes(str(path.resolve()).encode("utf-8"))[:12]
+    return PARQUET_CACHE_DIR / f"{PARQUET_CACHE_PREFIX}local_{path_key}_{stat.st_mtime_ns}_{stat.st_size}.parquet"
+
+@st.cache_resource
+def _parsed_frames_holder() -> dict:
+    """Process-wide parsed per-file frames keyed by parquet cache path (one entry per file revision)"""
+    return {"frames": {}, "lock": threading.Lock()}
+
+def _remember_parsed(cache_path: Path, df: pd.DataFrame):
+    """Keep a parsed frame in memory so the next load of this file revision skips parquet and Excel"""
+    holder = _parsed_frames_holder()
+    with holder["lock"]:
+        holder["frames"][cache_path] = df
+
+def _is_cached(cache_path) -> bool:
+    """Whether a parsed frame for this file revision is available in memory or in the parquet cache"""
+    return cache_path is not None and (cache_path in _parsed_frames_holder()["frames"] or cache_path.exists())
+
+def _write_parquet_cache(df: pd.DataFrame, cache_path: Path):
+    """Persist a parsed frame to the parquet cache; failures are logged and ignored"""
+    try:
+        PARQUET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(cache_path, compression="zstd", index=False)
+    except Exception as e:
+        logger.warning(f"Could not write parquet cache {cache_path.name}: {e}")
+
+def _evict_parquet_cache(sources, max_files: int = PARQUET_CACHE_MAX_FILES):
+    """Keep in-memory frames only for the sources just loaded, then drop parquet entries from older
+    cache versions and keep only the newest max_files current ones"""
+    # Keyed to the source set rather than the files on disk, so a frame whose parquet write failed stays memoized
+    live = {cache_path for _, _, cache_path in sources if cache_path is not None}
+    holder = _parsed_frames_holder()
+    with holder["lock"]:
+        for stale_key in [k for k in holder["frames"] if k not in live]:
+            del holder["frames"][stale_key]
+    if not PARQUET_CACHE_DIR.exists():
+        return
+    try:
+        cached = []
+        for path in PARQUET_CACHE_DIR.glob("*.parquet"):
+            if path.name.startswith(PARQUET_CACHE_PREFIX):
+                cached.append(path)
+            else:
+                path.unlink(missing_ok=True)
+        cached.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in cached[max_files:]:
+            stale.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"Could not evict parquet cache: {e}")
+
+def _ingest_one(source):
+    """Open, parse, normalize and validate one (name, opener, cache_path) source.
+    Returns (df, failure) where either may be None."""
+    name, opener, cache_path = source
+    
+    # Reuse the parsed frame if this exact revision was loaded before: from memory, else from parquet
+    if cache_path is not None:
+        df = _parsed_frames_holder()["frames"].get(cache_path)
+        if df is not None:
+            return df, None
+    if cache_path is not None and cache_path.exists():
+        try:
+            df = _to_canonical(pd.read_parquet(cache_path))
+            _remember_parsed(cache_path, df)
+            logger.info(f"Loaded {name} from parquet cache")
+            return df, None
+        except Exception as e:
+            logger.warning(f"Could not read parquet cache for {name}, reloading instead: {e}")
+    
+    try:
+        with opener() as fh:
+            if fh.seek(0, os.SEEK_END) == 0:
+                logger.warning(f"File {name} is empty, skipping")
+                return None, (name, "Empty file")
+            fh.seek(0)
+            
+            try:
+                df = _read_excel_fast(fh)
+            except Exception as e:
+                logger.warning(f"Failed to read {name} with fast reader, trying first sheet: {e}")
+                fh.seek(0)  # Reset file pointer
+                df = pd.read_excel(fh, sheet_name=0, engine="openpyxl", usecols=_keep_column)
+        
+        if df.empty:
+            logger.warning(f"File {name} is empty, skipping")
+            return None, (name, "Empty file")
+        
+        # Normalize column names
+        df = _normalize_cols(df)
+        
+        # Validate dataframe
+        is_valid, error_msg = validate_dataframe(df, name)
+        if not is_valid:
+            logger.warning(f"Validation failed for {name}: {error_msg}")
+            return None, (name, error_msg)
+        
+        # Date is parsed from __source_file after concatenation
+        df["__source_file"] = name
+        # A shared column order lets concat stack the frames without realignment
+        df = _to_canonical(df)
+        # Arrow strings instead of Python objects: compact to concat and to cache, and quick to dictionary-encode
+        df = df.astype({col: "string[pyarrow]" for col in IDENTIFIER_COLUMNS if col in df.columns})
+        # Coerce counts here, in the parallel per-file stage, so the cache stores int32 and the combined frame has little left to do
+        pendency_cols = [col for col in PENDENCY_COLUMNS if col in df.columns]
+        if pendency_cols:
+            counts = _coerce_counts(df, pendency_cols)
+            df = df.assign(**{col: counts[col] for col in pendency_cols})
+        if cache_path is not None:
+            _write_parquet_cache(df, cache_path)
+            _remember_parsed(cache_path, df)
+        logger.info(f"Successfully processed file: {name}")
+        return df, None
+    
+    except Exception as e:
+        logger.error(f"Error processing file {name}: {str(e)}")
+        return None, (name, str(e))
+
+def _prefetch(sources, executor: ThreadPoolExecutor, window: int = PREFETCH_WINDOW):
+    """Run uncached openers ahead on executor, at most window files ahead of the parsers consuming them.
+    The returned sources wait on the prefetched result; taking one submits the next opener in line."""
+    pending = [i for i, (_, _, cache_path) in enumerate(sources) if not _is_cached(cache_path)]
+    futures = {}
+    lock = threading.Lock()
+    submitted = 0
+    
+    def submit_through(count: int):
+        # Sliding window: openers are submitted in source order, never more than window past the last one taken
+        nonlocal submitted
+        with lock:
+            while submitted < min(count, len(pending)):
+                index = pending[submitted]
+                futures[index] = executor.submit(sources[index][1])
+                submitted += 1
+    
+    def take(position: int):
+        submit_through(position + 1 + window)
+        with lock:
+            future = futures.pop(pending[position])
+        return future.result()
+    
+    submit_through(window)
+    prefetched = list(sources)
+    for position, index in enumerate(pending):
+        name, _, cache_path = sources[index]
+        prefetched[index] = (name, lambda position=position: take(position), cache_path)
+    return prefetched
+
+def _ingest(sources, max_workers: int, prefetch_workers: int = 0, prefetch_window: int = PREFETCH_WINDOW):
+    """Ingest (name, opener, cache_path) sources in a thread pool, returning (frames, failures) in input order.
+    With prefetch_workers, openers (e.g. downloads) run on a separate pool so fetching overlaps parsing,
+    at most prefetch_window files ahead of the parsers."""
+    rows = []
+    failed_files = []
+    if not sources:
+        return rows, failed_files
+    # Cache hits and tiny folders are cheaper to read inline than to hand to a pool
+    uncached = sum(1 for _, _, cache_path in sources if not _is_cached(cache_path))
+    if uncached <= INLINE_INGEST_MAX_FILES:
+        for df, failure in map(_ingest_one, sources):
+            if df is not None:
+                rows.append(df)
+            if failure is not None:
+                failed_files.append(failure)
+        return rows, failed_files
+    with ExitStack() as pools:
+        # The download pool exists only when prefetching; it is shut down after the parse pool
+        if prefetch_workers:
+            download_pool = pools.enter_context(ThreadPoolExecutor(max_workers=min(prefetch_workers, len(sources))))
+            sources = _prefetch(sources, download_pool, prefetch_window)
+        executor = pools.enter_context(ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))))
+        for df, failure in executor.map(_ingest_one, sources):
+            if df is not None:
+                rows.append(df)
+            if failure is not None:
+                failed_files.append(failure)
+    return rows, failed_files
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _list_drive_files() -> list:
+    """Google Drive folder listing, cached separately from file contents"""
+    return storage.list_files()
+
+def _drive_fingerprint(drive_files: list) -> str:
+    """Fingerprint of a Drive listing (file ids and modification times)"""
+    records = sorted(f"{f.get('id', '')}\0{f.get('modifiedTime', '')}" for f in drive_files)
+    buf = "\n".join(records).encode("utf-8")
+    return f"{_hash_bytes(buf)}_{len(records)}"
+
 # Core function to load and process Excel files from Google Drive or local
 def _load_all_files_core(folder_path: str = None) -> pd.DataFrame:
     """Core function to load all Excel files from Google Drive or local folder and process them."""
@@ -135,7 +593,7 @@ def _load_all_files_core(folder_path: str = None) -> pd.DataFrame:
     if use_google_drive and storage and folder_path is None:
         try:
             logger.info("Loading files from Google Drive...")
-            drive_files = storage.list_files()
+            drive_files = _list_drive_files()
             
             if not drive_files:
                 logger.info("No Excel files found in Google Drive folder")
@@ -144,11 +602,11 @@ def _load_all_files_core(folder_path: str = None) -> pd.DataFrame:
             # Keep only Excel files
             excel_files = [
                 f for f in drive_files
-                if str(f.get("name", "")).lower().endswith((".xlsx", ".xls"))
+                if str(f.get("name", "")).lower().endswith(DRIVE_EXCEL_EXTENSIONS)
             ]
             
             if not excel_files:
-                logger.info("No Excel files with .xlsx/.xls extension found in Google Drive folder")
+                logger.info("No Excel files with .xlsx/.xls/.xlsb extension found in Google Drive folder")
                 return pd.DataFrame()
             
             # Sort Excel files by date in filename (YYYYMMDD) if present, otherwise by name
@@ -170,75 +628,13 @@ def _load_all_files_core(folder_path: str = None) -> pd.DataFrame:
             
             logger.info(f"Found {len(excel_files)} Excel files in Google Drive, loading last {len(recent_excel_files)}")
             
-            # Process only the selected recent files
-            for drive_file in recent_excel_files:
-                file_name = drive_file.get('name', '')
-                file_id = drive_file.get('id', '')
-                
-                # Skip non-Excel files (safety check)
-                if not file_name.endswith(('.xlsx', '.xls')):
-                    continue
-                
-                try:
-                    # Download file from Google Drive
-                    logger.info(f"Downloading file: {file_name}")
-                    file_data = storage.download_file(file_id)
-                    
-                    if file_data.getvalue() == b'':
-                        logger.warning(f"File {file_name} is empty, skipping")
-                        failed_files.append((file_name, "Empty file"))
-                        continue
-                    
-                    # Read Excel file from bytes
-                    try:
-                        df = pd.read_excel(file_data, engine="openpyxl")
-                    except Exception as e:
-                        logger.warning(f"Failed to read {file_name} with default sheet, trying first sheet: {e}")
-                        file_data.seek(0)  # Reset file pointer
-                        df = pd.read_excel(file_data, sheet_name=0, engine="openpyxl")
-                    
-                    if df.empty:
-                        logger.warning(f"File {file_name} is empty, skipping")
-                        failed_files.append((file_name, "Empty file"))
-                        continue
-                    
-                    # Normalize column names
-                    df_cols = {c.lower().strip(): c for c in df.columns}
-                    
-                    # Try to find and rename Total column
-                    if "total" not in df_cols:
-                        match = [c for c in df.columns if "total" in str(c).lower()]
-                        if match:
-                            df.rename(columns={match[0]: "Total"}, inplace=True)
-                    
-                    # Try to find and rename Sub Division column
-                    if "sub division" not in df_cols:
-                        match = [c for c in df.columns if "sub" in str(c).lower() and "division" in str(c).lower()]
-                        if match:
-                            df.rename(columns={match[0]: "Sub Division"}, inplace=True)
-                    
-                    # Validate dataframe
-                    is_valid, error_msg = validate_dataframe(df, file_name)
-                    if not is_valid:
-                        logger.warning(f"Validation failed for {file_name}: {error_msg}")
-                        failed_files.append((file_name, error_msg))
-                        continue
-                    
-                    # Parse date from filename
-                    m = FILENAME_DATE_RE.search(file_name)
-                    file_date = pd.to_datetime(m.group(1), format=DATE_FORMAT) if m else pd.NaT
-                    if pd.isna(file_date):
-                        logger.warning(f"Could not parse date from filename: {file_name}")
-                    
-                    df["__source_file"] = file_name
-                    df["__date"] = file_date
-                    rows.append(df)
-                    logger.info(f"Successfully processed file: {file_name}")
-                
-                except Exception as e:
-                    logger.error(f"Error processing file {file_name} from Google Drive: {str(e)}")
-                    failed_files.append((file_name, str(e)))
-                    continue
+            # Download and parse the selected recent files concurrently to overlap Drive latency
+            sources = [
+                (f.get("name", ""), lambda fid=f.get("id", ""): storage.download_file(fid), _drive_cache_path(f))
+                for f in recent_excel_files
+            ]
+            rows, failed_files = _ingest(sources, max_workers=min(os.cpu_count() or 1, 8), prefetch_workers=16)
+            _evict_parquet_cache(sources)
             
             # If we successfully loaded files from Google Drive, skip local loading
             if rows:
@@ -267,68 +663,34 @@ def _load_all_files_core(folder_path: str = None) -> pd.DataFrame:
                 if not rows:  # Only return empty if we have no data from Google Drive either
                     return pd.DataFrame()
             else:
-                files = sorted(folder.glob("*.xlsx"))
+                # One scandir pass; temporary Excel lock files (~$...) are skipped up front.
+                # The DirEntry stat doubles as the parquet cache key, so unchanged files skip Excel parsing
+                with os.scandir(folder) as it:
+                    files = sorted(
+                        ((Path(e.path), e.stat()) for e in it
+                         if e.name.endswith(LOCAL_EXCEL_EXTENSIONS) and not e.name.startswith("~$") and e.is_file()),
+                        key=lambda item: item[0].name,
+                    )
                 if not files:
                     logger.info(f"No Excel files found in {folder}")
                     if not rows:  # Only return empty if we have no data from Google Drive either
                         return pd.DataFrame()
                 else:
-                    # Process local files
-                    for f in files:
-                        # Skip temporary Excel files (lock files created by Excel when file is open)
-                        if f.name.startswith("~$"):
-                            continue
-                        
-                        try:
-                            # Try to read Excel file
-                            try:
-                                df = pd.read_excel(f, engine="openpyxl")
-                            except Exception as e:
-                                logger.warning(f"Failed to read {f.name} with default sheet, trying first sheet: {e}")
-                                df = pd.read_excel(f, sheet_name=0, engine="openpyxl")
-                            
-                            if df.empty:
-                                logger.warning(f"File {f.name} is empty, skipping")
-                                failed_files.append((f.name, "Empty file"))
-                                continue
-                            
-                            # Normalize column names
-                            df_cols = {c.lower().strip(): c for c in df.columns}
-                            
-                            # Try to find and rename Total column
-                            if "total" not in df_cols:
-                                match = [c for c in df.columns if "total" in str(c).lower()]
-                                if match:
-                                    df.rename(columns={match[0]: "Total"}, inplace=True)
-                            
-                            # Try to find and rename Sub Division column
-                            if "sub division" not in df_cols:
-                                match = [c for c in df.columns if "sub" in str(c).lower() and "division" in str(c).lower()]
-                                if match:
-                                    df.rename(columns={match[0]: "Sub Division"}, inplace=True)
-                            
-                            # Validate dataframe
-                            is_valid, error_msg = validate_dataframe(df, f.name)
-                            if not is_valid:
-                                logger.warning(f"Validation failed for {f.name}: {error_msg}")
-                                failed_files.append((f.name, error_msg))
-                                continue
-                            
-                            # Parse date from filename
-                            m = FILENAME_DATE_RE.search(f.name)
-                            file_date = pd.to_datetime(m.group(1), format=DATE_FORMAT) if m else pd.NaT
-                            if pd.isna(file_date):
-                                logger.warning(f"Could not parse date from filename: {f.name}")
-                            
-                            df["__source_file"] = f.name
-                            df["__date"] = file_date
-                            rows.append(df)
-                            logger.info(f"Successfully processed file: {f.name}")
-                        
-                        except Exception as e:
-                            logger.error(f"Error processing file {f.name}: {str(e)}")
-                            failed_files.append((f.name, str(e)))
-                            continue
+                    # Process local files concurrently. Each workbook is slurped with one read into memory (as Drive
+                    # downloads are), and large folders read ahead on the prefetch pool so disk I/O overlaps parsing.
+                    # Read-ahead stays within two files per parser, so peak memory does not grow with the folder size
+                    sources = [(f.name, lambda f=f: BytesIO(f.read_bytes()), _local_cache_path(f, stat)) for f, stat in files]
+                    parse_workers = min(os.cpu_count() or 1, 8)
+                    local_rows, local_failed = _ingest(
+                        sources,
+                        max_workers=parse_workers,
+                        prefetch_workers=LOCAL_PREFETCH_WORKERS if len(files) > LOCAL_PREFETCH_MIN_FILES else 0,
+                        prefetch_window=2 * parse_workers,
+                    )
+                    # Room for every current local file on top of the usual Drive allowance
+                    _evict_parquet_cache(sources, PARQUET_CACHE_MAX_FILES + len(files))
+                    rows.extend(local_rows)
+                    failed_files.extend(local_failed)
     
     if not rows:
         if failed_files:
@@ -336,729 +698,316 @@ def _load_all_files_core(folder_path: str = None) -> pd.DataFrame:
         return pd.DataFrame()
     
     try:
-        combined = pd.concat(rows, ignore_index=True, sort=False)
+        # Give every frame the same canonical column list (union of what the files provide) so concat
+        # stacks identical schemas instead of aligning columns frame by frame
+        combined_columns = [c for c in CANONICAL_COLUMNS if any(c in r.columns for r in rows)]
+        rows = [r if list(r.columns) == combined_columns else r.reindex(columns=combined_columns) for r in rows]
+        combined = pd.concat(rows, ignore_index=True)
     except Exception as e:
         logger.error(f"Error concatenating dataframes: {str(e)}")
         return pd.DataFrame()
     
+    # Parse dates from filenames: one regex + datetime parse per distinct file, broadcast to rows through the codes
+    source_files = combined["__source_file"].astype("category")
+    file_dates = pd.to_datetime(
+        source_files.cat.categories.str.extract(FILENAME_DATE_RE.pattern, expand=False),
+        format=DATE_FORMAT,
+        errors="coerce",
+    )
+    combined["__source_file"] = source_files
+    combined["__date"] = file_dates.take(source_files.cat.codes.to_numpy(), allow_fill=True, fill_value=pd.NaT)
+    undated = source_files.cat.categories[file_dates.isna()]
+    if len(undated) > 0:
+        logger.warning(f"Could not parse date from filenames: {list(undated)}")
+    
     # Standardize column names
     if "Total" not in combined.columns and "TOTAL" in combined.columns:
         combined.rename(columns={"TOTAL": "Total"}, inplace=True)
     
-    # Define pendency columns
-    pendency_columns = [
-        "Uncontested Pendency", "Income Certificate", "Copying Service",
-        "Inspection Records", "Overdue Mortgage", "Overdue Court Orders",
-        "Overdue Fardbadars"
-    ]
-    
-    # Convert all pendency columns to numeric
-    for col in pendency_columns:
-        if col in combined.columns:
-            combined[col] = pd.to_numeric(combined[col], errors="coerce").fillna(0).astype(int)
+    # Convert all pendency columns to numeric in one block operation. Per-file frames arrive already coerced,
+    # so this only fills the gaps left by files that lack a column
+    present_pendency_cols = [col for col in PENDENCY_COLUMNS if col in combined.columns]
+    pendency_block = None
+    if present_pendency_cols:
+        counts = _coerce_counts(combined, present_pendency_cols)
+        combined[present_pendency_cols] = counts
+        # Keep the coerced int32 block so a missing Total is summed from it without re-selecting the columns
+        pendency_block = counts.to_numpy(dtype="int32", copy=False)
     
     # Calculate Total if it doesn't exist (sum of all pendency columns)
     if "Total" not in combined.columns:
-        available_pendency_cols = [col for col in pendency_columns if col in combined.columns]
-        if available_pendency_cols:
-            combined["Total"] = combined[available_pendency_cols].sum(axis=1)
+        if pendency_block is not None:
+            combined["Total"] = pendency_block.sum(axis=1, dtype="int32")
         else:
             combined["Total"] = 0
     else:
-        # Convert Total to numeric if it exists
-        combined["Total"] = pd.to_numeric(combined["Total"], errors="coerce").fillna(0).astype(int)
+        # Convert Total to numeric if it exists; an already-numeric Total skips the text parse
+        combined["Total"] = _coerce_counts(combined, ["Total"])["Total"]
     
     # Ensure Sub Division column
     if "Sub Division" not in combined.columns and "SubDivision" in combined.columns:
         combined.rename(columns={"SubDivision": "Sub Division"}, inplace=True)
     
-    # Standardize Rank (optional - only if exists)
+    # Standardize Rank (optional - only if exists). Whole-number ranks become nullable Int16 (2 bytes plus a
+    # validity mask); anything fractional stays float32, which keeps NaN for missing ranks at half the width
     if "Rank" in combined.columns:
-        combined["Rank"] = pd.to_numeric(combined["Rank"], errors="coerce")
+        rank = pd.to_numeric(combined["Rank"], errors="coerce", downcast="float")
+        rank_values = rank.to_numpy()
+        known = rank_values[~np.isnan(rank_values)]
+        if (known == np.trunc(known)).all() and (np.abs(known) <= np.iinfo(np.int16).max).all():
+            rank = rank.astype("Int16")
+        combined["Rank"] = rank
     
     # Fill missing useful columns
     for col in ["Officer", "Sub Division"]:
         if col not in combined.columns:
             combined[col] = "Unknown"
     
+    # Identifier columns repeat across every daily file, so store them as categoricals
+    for col in [*IDENTIFIER_COLUMNS, "__source_file"]:
+        if col in combined.columns:
+            combined[col] = combined[col].astype("category")
+    
     if failed_files:
         logger.warning(f"Some files failed to load: {failed_files}")
     
     return combined
 
-# Non-cached version for when we need fresh data
-def _load_all_files_uncached(folder_path: str = None) -> pd.DataFrame:
-    """Load files without caching - used for refresh"""
-    return _load_all_files_core(folder_path)
+# Cached version for normal operation.
+# The combined frame lives in a cache_resource and is returned by reference, so cache
+# hits skip the pickle round-trip that st.cache_data does on every rerun.
+LOAD_CACHE_TTL = 1800  # seconds
+LOAD_CACHE_MAX_ENTRIES = 4
+
+# Adding, removing or renaming a workbook (including Excel's save-via-rename) bumps the folder mtime and
+# forces a rescan at once; files rewritten in place are picked up by this periodic rescan or Refresh
+FOLDER_RESCAN_INTERVAL = 30  # seconds
+
+def _hash_bytes(buf) -> str:
+    """Fast 64-bit hex digest of a bytes buffer"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(buf)
+    return hashlib.blake2b(buf, digest_size=8).hexdigest()
 
-# Cached version for normal operation
-@st.cache_data(ttl=1800, show_spinner="Loading data files...")
-def load_all_files(folder_path: str = None, cache_version: str = "v1") -> pd.DataFrame:
+def _scan_excel_files(folder: Path) -> list:
+    """(name, mtime_ns, size) for each Excel file in a local folder"""
+    # One scandir pass; DirEntry caches its stat, so each file is stat'ed once
+    file_info = []
+    with os.scandir(folder) as it:
+        for entry in it:
+            if not entry.name.endswith(LOCAL_EXCEL_EXTENSIONS) or entry.name.startswith("~$"):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                file_info.append((entry.name, stat.st_mtime_ns, stat.st_size))
+            except OSError as e:
+                logger.warning(f"Could not get file stats for {entry.name}: {e}")
+                file_info.append((entry.name, 0, 0))
+    return file_info
+
+def _cheap_signature(folder: Path, file_info: list) -> tuple:
+    """Cheap change detector: folder mtime (changes on add/remove/rename), file count, newest mtime, total size"""
+    return (
+        folder.stat().st_mtime_ns,
+        len(file_info),
+        max((mtime_ns for _, mtime_ns, _ in file_info), default=0),
+        sum(size for _, _, size in file_info),
+    )
+
+@st.cache_data(ttl=FOLDER_RESCAN_INTERVAL, show_spinner=False, max_entries=8)
+def _folder_scan(folder_str: str, folder_mtime_ns: int) -> tuple:
+    """(cheap signature, file info) for a local folder, memoized per folder mtime so reruns skip the per-file stats"""
+    folder = Path(folder_str)
+    file_info = _scan_excel_files(folder)
+    return _cheap_signature(folder, file_info), file_info
+
+def _inputs_fingerprint(file_info: list) -> str:
+    """Fingerprint of the Excel files in a local folder (names, modification times, sizes)"""
+    # Pack sorted (name, mtime_ns, size) records into one buffer and hash it once;
+    # the file count is included for better detection
+    buf = bytearray()
+    for name, mtime_ns, size in sorted(file_info):
+        buf += name.encode("utf-8") + b"\0" + mtime_ns.to_bytes(8, "little") + size.to_bytes(8, "little")
+    return f"{_hash_bytes(buf)}_{len(file_info)}"
+
+@st.cache_resource
+def _combined_holder() -> dict:
+    """Process-wide store of loaded frames keyed by (folder_path, fingerprint), plus in-flight loads"""
+    return {"entries": {}, "pending": {}, "lock": threading.Lock()}
+
+def load_all_files(folder_path: str = None, fingerprint: str = None) -> pd.DataFrame:
     """
     Load all Excel files from Google Drive or local folder.
-    cache_version is used to force cache refresh when files change.
+    fingerprint identifies the input files (see _inputs_fingerprint), so the cache
+    invalidates exactly when they change.
+    The returned DataFrame is shared across reruns and sessions - do not modify it in place.
     """
-    return _load_all_files_core(folder_path)
-
-# ---------- UI ----------
-# Official Professional Styling with Mobile Responsiveness
-st.markdown("""
-<style>
-    /* Mobile-first viewport settings */
-    @media screen and (max-width: 768px) {
-        /* Main container styling - mobile */
-        .main .block-container {
-            padding-top: 1rem;
-            padding-bottom: 1rem;
-            padding-left: 1rem;
-            padding-right: 1rem;
-            max-width: 100%;
-        }
-        
-        /* Official title styling - mobile */
-        h1 {
-            font-size: 1.4rem !important;
-            margin-bottom: 0.3rem;
-            padding-bottom: 0.3rem;
-        }
-        
-        /* Section headers - mobile */
-        h2 {
-            font-size: 1.1rem !important;
-            margin-top: 1rem;
-            margin-bottom: 0.5rem;
-            padding: 0.3rem 0;
-        }
-        
-        h3 {
-            font-size: 1rem !important;
-            margin-top: 0.8rem;
-            margin-bottom: 0.4rem;
-        }
-        
-        /* Metric cards - mobile */
-        [data-testid="stMetricValue"] {
-            font-size: 1.5rem !important;
-        }
-        
-        [data-testid="stMetricDelta"] {
-            font-size: 0.85rem !important;
-        }
-        
-        [data-testid="stMetricLabel"] {
-            font-size: 0.8rem !important;
-        }
-        
-        /* Sidebar - mobile */
-        [data-testid="stSidebar"] {
-            min-width: 200px;
-        }
-        
-        /* Buttons - mobile - larger touch targets */
-        .stButton > button {
-            min-height: 44px;
-            font-size: 0.95rem;
-            padding: 0.6rem 1rem;
-        }
-        
-        /* Tables - mobile - horizontal scroll */
-        .dataframe {
-            font-size: 0.85rem;
-            display: block;
-            overflow-x: auto;
-            -webkit-overflow-scrolling: touch;
-        }
-        
-        /* Chart container - mobile */
-        .js-plotly-plot {
-            width: 100% !important;
-            height: auto !important;
-        }
-        
-        /* Selectboxes and inputs - mobile */
-        .stSelectbox > div > div,
-        .stNumberInput > div > div > input,
-        .stDateInput > div > div > input {
-            font-size: 16px !important; /* Prevents zoom on iOS */
-            min-height: 44px;
-        }
-        
-        /* Tabs - mobile */
-        [data-baseweb="tab-list"] {
-            flex-wrap: wrap;
-        }
-        
-        [data-baseweb="tab"] {
-            min-height: 44px;
-            font-size: 0.9rem;
-        }
-        
-        /* Footer text - mobile */
-        .element-container {
-            font-size: 0.8rem;
-        }
-        
-        /* Column spacing - mobile */
-        .row-widget.stHorizontal {
-            flex-wrap: wrap;
-        }
-    }
-    
-    /* Tablet adjustments */
-    @media screen and (min-width: 769px) and (max-width: 1024px) {
-        .main .block-container {
-            padding-left: 2rem;
-            padding-right: 2rem;
-            max-width: 100%;
-        }
-        
-        h1 {
-            font-size: 1.6rem;
-        }
-        
-        [data-testid="stMetricValue"] {
-            font-size: 1.75rem;
-        }
-    }
-    
-    /* Desktop styling */
-    @media screen and (min-width: 1025px) {
-        .main .block-container {
-            padding-top: 1.5rem;
-            padding-bottom: 1.5rem;
-            max-width: 1400px;
-        }
-    }
-    
-    /* Main container styling - base */
-    .main .block-container {
-        padding-top: 1.5rem;
-        padding-bottom: 1.5rem;
-    }
-    
-    /* Official title styling - subtle */
-    h1 {
-        color: #003366;
-        font-weight: 600;
-        font-size: 1.75rem;
-        margin-bottom: 0.5rem;
-        padding-bottom: 0.5rem;
-        letter-spacing: 0.3px;
-        word-wrap: break-word;
-    }
-    
-    /* Section headers - subtle and clean */
-    h2 {
-        color: #003366;
-        font-weight: 600;
-        font-size: 1.2rem;
-        margin-top: 1.5rem;
-        margin-bottom: 0.75rem;
-        padding: 0.5rem 0;
-        border-bottom: 2px solid #e0e0e0;
-        word-wrap: break-word;
-    }
-    
-    h3 {
-        color: #003366;
-        font-weight: 600;
-        font-size: 1.1rem;
-        margin-top: 1rem;
-        margin-bottom: 0.5rem;
-        word-wrap: break-word;
-    }
-    
-    /* Metric cards - prominent and clear */
-    [data-testid="stMetricValue"] {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #003366;
-    }
-    
-    [data-testid="stMetricDelta"] {
-        font-size: 1rem;
-        font-weight: 600;
-    }
-    
-    [data-testid="stMetricLabel"] {
-        font-size: 0.9rem;
-        font-weight: 500;
-        color: #666;
-    }
-    
-    /* Professional info boxes */
-    .stInfo {
-        background-color: #f0f7ff;
-        border-left: 4px solid #0066cc;
-        border-radius: 2px;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-    }
+    holder = _combined_holder()
+    key = (folder_path, fingerprint)
+    # The lock only guards the dict lookups and inserts; the load itself runs outside it, so sessions
+    # asking for an already-loaded key are never blocked by another session's load. Concurrent misses
+    # on the same key share one Future, so the files are still read once.
+    with holder["lock"]:
+        entries, pending = holder["entries"], holder["pending"]
+        now = time.time()
+        for stale_key in [k for k, (_, loaded_at) in entries.items() if now - loaded_at > LOAD_CACHE_TTL]:
+            del entries[stale_key]
+        if key in entries:
+            return entries[key][0]
+        future = pending.get(key)
+        is_loader = future is None
+        if is_loader:
+            future = pending[key] = Future()
+    
+    if not is_loader:
+        return future.result()
     
-    .stSuccess {
-        background-color: #f0fff4;
-        border-left: 4px solid #28a745;
-        border-radius: 2px;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-    }
-    
-    .stWarning {
-        background-color: #fffbf0;
-        border-left: 4px solid #ff9800;
-        border-radius: 2px;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-    }
-    
-    .stError {
-        background-color: #fff0f0;
-        border-left: 4px solid #dc3545;
-        border-radius: 2px;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-    }
-    
-    /* Professional sidebar */
-    [data-testid="stSidebar"] {
-        background-color: #ffffff;
-    }
-    
-    /* Sidebar on mobile - ensure it's accessible */
-    @media screen and (max-width: 768px) {
-        [data-testid="stSidebar"][aria-expanded="true"] {
-            min-width: 250px;
-        }
-    }
-    
-    /* Professional dividers */
-    hr {
-        border: none;
-        height: 1px;
-        background-color: #e0e0e0;
-        margin: 1.5rem 0;
-    }
-    
-    @media screen and (max-width: 768px) {
-        hr {
-            margin: 1rem 0;
-        }
-    }
-    
-    /* Professional button styling */
-    .stButton > button {
-        background-color: #003366;
-        color: white;
-        border: 1px solid #003366;
-        border-radius: 4px;
-        font-weight: 500;
-        transition: background-color 0.2s ease;
-        min-height: 38px;
-        padding: 0.5rem 1rem;
-    }
-    
-    .stButton > button:hover {
-        background-color: #004488;
-        border-color: #004488;
-    }
-    
-    .stButton > button:active {
-        transform: scale(0.98);
-    }
-    
-    /* Professional table styling */
-    .dataframe {
-        border: 1px solid #e0e0e0;
-        border-radius: 2px;
-        width: 100%;
-        overflow-x: auto;
-    }
-    
-    /* Make tables scrollable on mobile */
-    @media screen and (max-width: 768px) {
-        div[data-testid="stDataFrame"],
-        div[data-testid="stDataFrame"] > div {
-            overflow-x: auto !important;
-            -webkit-overflow-scrolling: touch;
-            width: 100% !important;
-            display: block !important;
-        }
-        
-        /* Make table cells more readable on mobile */
-        .dataframe th,
-        .dataframe td {
-            padding: 8px 6px !important;
-            font-size: 0.8rem !important;
-            white-space: nowrap;
-        }
-        
-        /* Reduce table font size */
-        .dataframe {
-            font-size: 0.75rem !important;
-        }
-    }
-    
-    /* Professional progress bar */
-    .stProgress > div > div > div {
-        background-color: #0066cc;
-    }
-    
-    /* Chart container - clean and responsive */
-    .js-plotly-plot {
-        border: 1px solid #e0e0e0;
-        border-radius: 2px;
-        width: 100% !important;
-        max-width: 100%;
-    }
-    
-    /* Ensure plotly charts are responsive */
-    .plotly {
-        width: 100% !important;
-        height: 100% !important;
-    }
-    
-    /* Mobile-specific chart adjustments */
-    @media screen and (max-width: 768px) {
-        .plotly .modebar {
-            display: none !important; /* Hide modebar on mobile for cleaner view */
-        }
-        
-        /* Make legends horizontal on mobile for better readability */
-        .js-plotly-plot .legend {
-            position: relative !important;
-            font-size: 10px !important;
-        }
-        
-        /* Adjust chart heights for mobile */
-        .js-plotly-plot {
-            min-height: 250px !important;
-            max-height: 400px !important;
-        }
-        
-        /* Better margins for mobile charts */
-        .plotly .plot-container {
-            padding: 5px !important;
-        }
-        
-        /* Reduce chart font sizes on mobile */
-        .plotly .xtick text,
-        .plotly .ytick text {
-            font-size: 10px !important;
-        }
-    }
-    
-    /* Title header - responsive */
-    .title-header {
-        padding: 1rem 1.5rem;
-        margin-bottom: 1.5rem;
-    }
-    
-    @media screen and (max-width: 768px) {
-        .title-header {
-            padding: 0.75rem 1rem;
-            margin-bottom: 1rem;
-        }
-        
-        .title-header h1 {
-            font-size: 1.4rem !important;
-        }
-        
-        .title-header p {
-            font-size: 0.85rem !important;
-        }
-    }
-    
-    /* Column layouts - optimize for mobile */
-    @media screen and (max-width: 768px) {
-        /* Metrics in 2x2 grid on mobile for better space usage */
-        /* Target rows that contain metrics */
-        .row-widget.stHorizontal {
-            display: flex !important;
-            flex-wrap: wrap !important;
-            gap: 0.5rem !important;
-        }
-        
-        /* For rows with exactly 4 columns (like Key Metrics), use 2x2 grid */
-        .row-widget.stHorizontal [data-testid="column"]:nth-child(1),
-        .row-widget.stHorizontal [data-testid="column"]:nth-child(2),
-        .row-widget.stHorizontal [data-testid="column"]:nth-child(3),
-        .row-widget.stHorizontal [data-testid="column"]:nth-child(4) {
-            width: calc(50% - 0.25rem) !important;
-            flex: 0 0 calc(50% - 0.25rem) !important;
-            min-width: calc(50% - 0.25rem) !important;
-            max-width: calc(50% - 0.25rem) !important;
-            margin-bottom: 0.5rem !important;
-            margin-right: 0 !important;
-            padding: 0 !important;
-        }
-        
-        /* Every 2nd column (2, 4, 6...) - no special treatment needed with gap */
-        /* For rows with 2 or 3 columns, stack them */
-        .row-widget.stHorizontal [data-testid="column"]:only-child,
-        .row-widget.stHorizontal [data-testid="column"]:nth-child(n+5) {
-            width: 100% !important;
-            flex: 1 1 100% !important;
-            min-width: 100% !important;
-            max-width: 100% !important;
-            margin-right: 0 !important;
-        }
-        
-        /* Settings row and other non-metric rows - stack vertically */
-        /* Use more specific selectors for better compatibility */
-        .row-widget.stHorizontal [data-testid="column"] .stNumberInput,
-        .row-widget.stHorizontal [data-testid="column"] .stButton,
-        .row-widget.stHorizontal [data-testid="column"] .stSelectbox,
-        .row-widget.stHorizontal [data-testid="column"] input,
-        .row-widget.stHorizontal [data-testid="column"] button {
-            width: 100% !important;
-        }
-        
-        /* Force full width for columns containing inputs/buttons */
-        .row-widget.stHorizontal [data-testid="column"]:has(.stNumberInput),
-        .row-widget.stHorizontal [data-testid="column"]:has(.stButton),
-        .row-widget.stHorizontal [data-testid="column"]:has(.stSelectbox) {
-            width: 100% !important;
-            flex: 1 1 100% !important;
-            min-width: 100% !important;
-            max-width: 100% !important;
-            margin-right: 0 !important;
-        }
-    }
-    
-    /* Improve touch targets for all interactive elements */
-    button, 
-    [role="button"],
-    input[type="checkbox"],
-    input[type="radio"],
-    select,
-    .stSelectbox label,
-    .stNumberInput label,
-    .stDateInput label {
-        min-height: 44px;
-        min-width: 44px;
-    }
-    
-    /* Text inputs - prevent zoom on iOS */
-    input[type="text"],
-    input[type="number"],
-    input[type="date"],
-    select {
-        font-size: 16px !important;
-    }
-    
-    /* Improve readability on mobile */
-    @media screen and (max-width: 768px) {
-        p, li, span, div {
-            font-size: 0.9rem;
-            line-height: 1.6;
-        }
-        
-        /* Captions */
-        .stCaption {
-            font-size: 0.75rem;
-        }
-    }
-    
-    /* Better spacing for mobile */
-    @media screen and (max-width: 768px) {
-        .element-container {
-            margin-bottom: 0.75rem;
-        }
-    }
-    
-    /* Card-like elements - better mobile display */
-    @media screen and (max-width: 768px) {
-        div[style*="background"] {
-            padding: 0.75rem !important;
-            margin: 0.5rem 0 !important;
-        }
-    }
-    
-    /* Additional mobile optimizations */
-    @media screen and (max-width: 768px) {
-        /* Sidebar improvements */
-        [data-testid="stSidebar"] {
-            padding: 1rem 0.75rem !important;
-        }
-        
-        /* Multiselect improvements for mobile */
-        [data-baseweb="select"] {
-            min-height: 44px !important;
-        }
-        
-        [data-baseweb="select"] input {
-            font-size: 16px !important;
-            min-height: 44px !important;
-        }
-        
-        /* Date input improvements */
-        .stDateInput > div > div > input {
-            font-size: 16px !important;
-            min-height: 44px !important;
-        }
-        
-        /* Number input improvements */
-        .stNumberInput > div > div > input {
-            font-size: 16px !important;
-            min-height: 44px !important;
-        }
-        
-        /* Tabs - make them more touch-friendly */
-        [data-baseweb="tab-list"] {
-            overflow-x: auto;
-            -webkit-overflow-scrolling: touch;
-        }
-        
-        [data-baseweb="tab"] {
-            min-width: 100px;
-            padding: 0.75rem 1rem !important;
-            font-size: 0.85rem !important;
-        }
-        
-        /* Expander/collapsible sections */
-        .streamlit-expanderHeader {
-            font-size: 0.9rem !important;
-            padding: 0.75rem !important;
-            min-height: 44px !important;
-        }
-        
-        /* Better spacing for download buttons */
-        .stDownloadButton > button {
-            width: 100% !important;
-            margin-bottom: 0.5rem;
-        }
-        
-        /* Alert and info boxes - better mobile display */
-        .stAlert,
-        .stInfo,
-        .stSuccess,
-        .stWarning,
-        .stError {
-            padding: 0.75rem !important;
-            margin: 0.75rem 0 !important;
-            font-size: 0.85rem !important;
-            line-height: 1.5 !important;
-        }
-        
-        /* Metrics - better spacing on mobile */
-        [data-testid="stMetricContainer"] {
-            padding: 0.5rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        /* Compact metrics for 2x2 grid */
-        [data-testid="stMetric"] {
-            padding: 0.5rem !important;
-        }
-        
-        [data-testid="stMetricValue"] {
-            font-size: 1.3rem !important;
-            line-height: 1.2 !important;
-        }
-        
-        [data-testid="stMetricLabel"] {
-            font-size: 0.75rem !important;
-            margin-bottom: 0.25rem !important;
-        }
-        
-        [data-testid="stMetricDelta"] {
-            font-size: 0.7rem !important;
-            margin-top: 0.25rem !important;
-        }
-        
-        /* Ensure metric containers don't overflow */
-        [data-testid="stMetricContainer"] {
-            overflow: hidden !important;
-        }
-        
-        /* Better spacing for metric cards in grid */
-        [data-testid="column"] [data-testid="stMetricContainer"] {
-            height: auto !important;
-            min-height: 80px !important;
-        }
-        
-        /* Reduce padding in main content area */
-        .main .block-container {
-            padding-left: 0.75rem !important;
-            padding-right: 0.75rem !important;
-        }
-        
-        /* Improve caption readability */
-        .stCaption {
-            font-size: 0.7rem !important;
-            line-height: 1.4 !important;
-        }
-        
-        /* Better spacing for markdown content */
-        .stMarkdown {
-            margin-bottom: 0.75rem !important;
-        }
-        
-        /* Ensure all text is readable */
-        .stMarkdown p,
-        .stMarkdown li,
-        .stMarkdown span {
-            font-size: 0.85rem !important;
-            line-height: 1.6 !important;
-        }
-        
-        /* Progress bars - better visibility */
-        .stProgress > div {
-            margin: 0.5rem 0 !important;
-        }
-        
-        /* Hide unnecessary elements on mobile */
-        .stApp > header {
-            padding: 0.5rem 0.75rem !important;
-        }
-        
-        /* Better button groups */
-        .stButton {
-            width: 100% !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        /* Ensure horizontal scroll works for wide content */
-        .element-container {
-            overflow-x: visible !important;
-        }
-        
-        /* Fix for plotly charts in columns */
-        [data-testid="column"] .js-plotly-plot {
-            width: 100% !important;
-            max-width: 100% !important;
-        }
+    try:
+        df = _load_all_files_core(folder_path)
+    except BaseException as e:
+        with holder["lock"]:
+            if holder["pending"].get(key) is future:
+                del holder["pending"][key]
+        future.set_exception(e)
+        raise
+    
+    with holder["lock"]:
+        entries, pending = holder["entries"], holder["pending"]
+        # A clear_loaded_files() during the load drops this Future; its result is then not cached
+        if pending.get(key) is future:
+            del pending[key]
+            # Frames loaded from an older fingerprint of the same source are superseded
+            for stale_key in [k for k in entries if k[0] == folder_path]:
+                del entries[stale_key]
+            entries[key] = (df, time.time())
+            while len(entries) > LOAD_CACHE_MAX_ENTRIES:
+                del entries[min(entries, key=lambda k: entries[k][1])]
+    future.set_result(df)
+    return df
+
+def clear_loaded_files():
+    """Drop all loaded frames so the next load_all_files call re-reads the files"""
+    holder = _combined_holder()
+    with holder["lock"]:
+        holder["entries"].clear()
+        holder["pending"].clear()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def filter_options(_df: pd.DataFrame, data_key: tuple) -> dict:
+    """Sidebar option lists per filter column; _df is identified by data_key, so they only change when the inputs do"""
+    return {
+        col: category_options(_df[col])
+        for col in ("Sub Division", "Tehsil/Sub Tehsil", "Officer")
+        if col in _df.columns
     }
-    
-    /* Very small screens (phones in portrait) */
-    @media screen and (max-width: 480px) {
-        h1 {
-            font-size: 1.2rem !important;
-        }
-        
-        h2 {
-            font-size: 1rem !important;
-        }
-        
-        h3 {
-            font-size: 0.9rem !important;
-        }
-        
-        [data-testid="stMetricValue"] {
-            font-size: 1.25rem !important;
-        }
-        
-        .main .block-container {
-            padding-left: 0.5rem !important;
-            padding-right: 0.5rem !important;
-        }
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def date_bounds(_df: pd.DataFrame, data_key: tuple) -> tuple:
+    """(min, max) of __date for the loaded frame; _df is identified by data_key"""
+    return _df["__date"].min(), _df["__date"].max()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def officer_history_index(_df: pd.DataFrame, data_key: tuple, filter_key: tuple) -> pd.Series:
+    """Total per (Sub Division, Tehsil, Officer, date) for a filtered frame, sliced for the officer sparklines"""
+    keys = [col for col in ("Sub Division", "Tehsil/Sub Tehsil", "Officer") if col in _df.columns] + ["__date"]
+    return _df.groupby(keys, observed=True, dropna=False, sort=True)["Total"].sum()
+
+def officer_trend(history: pd.Series, subdiv, tehsil, officer) -> pd.DataFrame:
+    """Per-date Total for one officer from officer_history_index; tehsil=None matches every tehsil"""
+    try:
+        if "Tehsil/Sub Tehsil" not in history.index.names:
+            trend = history.loc[(subdiv, officer)]
+        elif tehsil is None:
+            trend = history.xs((subdiv, officer), level=["Sub Division", "Officer"]).groupby(level="__date", observed=True).sum()
+        else:
+            trend = history.loc[(subdiv, tehsil, officer)]
+    except KeyError:
+        return pd.DataFrame()
+    return trend.reset_index()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def aggregate_filtered(_df: pd.DataFrame, data_key: tuple, filter_key: tuple) -> dict:
+    """
+    Every aggregate the overview renders for a filtered frame: per-date sub-division totals, the overall
+    trend, latest/previous period slices, latest pendency sums, the heatmap matrix and Tehsil-level totals.
+    _df is not hashed - data_key (which inputs were loaded) and filter_key (sidebar selections) identify it,
+    so revisiting a filter combination skips the aggregation.
+    """
+    agg_by_sub = _df.groupby(["__date", "Sub Division"], as_index=False, observed=True)["Total"].sum()
+    
+    # The groupby output is sorted by date, so the latest and previous periods are its last two dates
+    # and their per-subdivision totals are slices of agg_by_sub rather than fresh groupbys
+    snapshot_dates = pd.DatetimeIndex(agg_by_sub["__date"].unique())
+    latest_date = snapshot_dates[-1] if len(snapshot_dates) > 0 else pd.NaT
+    previous_date = snapshot_dates[-2] if len(snapshot_dates) > 1 else None
+    snapshot_grouped = agg_by_sub.loc[agg_by_sub["__date"] == latest_date, ["Sub Division", "Total"]].reset_index(drop=True)
+    # One merge attaches every sub-division's previous-period total, so deltas need no per-row lookups
+    if previous_date is not None:
+        previous_grouped = agg_by_sub.loc[agg_by_sub["__date"] == previous_date, ["Sub Division", "Total"]]
+        snapshot_grouped = snapshot_grouped.merge(
+            previous_grouped.rename(columns={"Total": "Previous Total"}), on="Sub Division", how="left"
+        )
+        snapshot_grouped["Previous Total"] = snapshot_grouped["Previous Total"].fillna(0).astype(np.int64)
+    else:
+        snapshot_grouped["Previous Total"] = np.int64(0)
+    
+    # Pendency columns are coerced to int32 at load time, so the latest rows form one int32 block;
+    # reduce it in a single NumPy pass, accumulating in int64 so large totals cannot overflow
+    pendency_cols = [col for col in PENDENCY_COLUMNS if col in _df.columns]
+    heatmap_df = pd.DataFrame()
+    tehsil_totals = None
+    if pd.notna(latest_date):
+        latest = _df.loc[(_df["__date"] == latest_date).to_numpy()]
+        block = latest[pendency_cols].to_numpy(dtype=np.int32)
+        pendency_sums = pd.Series(block.sum(axis=0, dtype=np.int64).astype(float), index=pendency_cols)
+        
+        # Heatmap: first 15 sub-divisions in order of appearance
+        if pendency_cols:
+            heatmap_df = (
+                latest.groupby("Sub Division", observed=True, sort=False)[pendency_cols]
+                .sum()
+                .head(15)
+                .astype(float)
+            )
         
-        [data-testid="stSidebar"] {
-            padding: 0.75rem 0.5rem !important;
-        }
+        # Tehsil-level summary totals, so toggling the summary view does not regroup
+        if "Tehsil/Sub Tehsil" in latest.columns:
+            tehsil_totals = (
+                latest.groupby("Tehsil/Sub Tehsil", as_index=False, observed=True)[pendency_cols + ["Total"]]
+                .sum()
+                .astype({col: float for col in pendency_cols + ["Total"]})
+            )
+    else:
+        pendency_sums = pd.Series(dtype=float)
+    
+    return {
+        "agg_by_sub": agg_by_sub,
+        "total_trend": agg_by_sub.groupby("__date", as_index=False, observed=True)["Total"].sum(),
+        "latest_date": latest_date,
+        "previous_date": previous_date,
+        "snapshot_grouped": snapshot_grouped,
+        "pendency_sums": pendency_sums,
+        "heatmap_df": heatmap_df,
+        "tehsil_totals": tehsil_totals,
     }
-</style>
-""", unsafe_allow_html=True)
+
+# ---------- UI ----------
+# Official Professional Styling with Mobile Responsiveness
+@st.cache_resource
+def _dashboard_style_tag() -> str:
+    """Read and minify the dashboard stylesheet once per process"""
+    css = (Path(__file__).parent / "assets" / "dashboard.css").read_text(encoding="utf-8")
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css).strip()
+    return f"<style>{css}</style>"
+
+# Streamlit drops elements that are not re-emitted on a rerun, so the tag is sent every run;
+# building it once and minifying it keeps that per-rerun message small. st.html skips the client-side
+# markdown parse of the stylesheet, and a style-only payload is mounted without taking up layout space
+st.html(_dashboard_style_tag())
 
 # Use session state data folder (no user input needed)
 data_folder = st.session_state.data_folder
@@ -1070,38 +1019,11 @@ threshold = 50
 # Prominent Header with Reload Button on Right
 header_col1, header_col2 = st.columns([3, 1])
 with header_col1:
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #003366 0%, #0066cc 100%); padding: 1.5rem 2rem; margin-bottom: 1.5rem; border-radius: 8px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-        <h1 style="color: #ffffff; margin: 0; padding: 0; border: none; font-size: 2rem; font-weight: 700; letter-spacing: 0.5px;">FCR Daily Dashboard</h1>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 with header_col2:
     st.markdown("<br>", unsafe_allow_html=True)  # Spacing for alignment
-    # Beautiful reload button with custom styling
-    st.markdown("""
-    <style>
-    div[data-testid="stButton"] > button[kind="primary"][data-baseweb="button"] {
-        background-color: #ffffff !important;
-        color: #003366 !important;
-        border: 2px solid #ffffff !important;
-        border-radius: 8px !important;
-        padding: 0.75rem 1.5rem !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.2) !important;
-        width: 100% !important;
-    }
-    div[data-testid="stButton"] > button[kind="primary"][data-baseweb="button"]:hover {
-        background-color: #f0f0f0 !important;
-        color: #003366 !important;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.3) !important;
-        transform: translateY(-2px) !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+    # Reload button styling lives in assets/dashboard.css
     if st.button("🔄 Reload Data", type="primary", width='stretch', key="reload_button"):
         # Set flag in session state to persist across reruns
         st.session_state.refresh_requested = True
@@ -1109,92 +1031,45 @@ with header_col2:
     
     refresh = st.session_state.get("refresh_requested", False)
 
-# Generate cache key based on files in local folder.
-# For Google Drive, we rely on the Reload button and Streamlit cache instead of
-# scanning Drive on every rerun (which is slow).
+# Fingerprint the input files so the loaded-data cache is keyed on what is actually stored.
+# For Google Drive, the folder listing is cached for a minute so reruns do not hit the API each time;
+# the local folder scan is keyed on the folder mtime, so a rerun costs one stat until the folder changes.
 if use_google_drive and storage:
-    current_file_hash = None
-    files_changed = False
+    if refresh:
+        _list_drive_files.clear()
+    current_file_hash = _drive_fingerprint(_list_drive_files())
 elif DATA_FOLDER.exists():
-    files_in_folder = sorted([f.name for f in DATA_FOLDER.glob("*.xlsx") if not f.name.startswith("~$")])
-    # Use file names, modification times, and file sizes for cache key (more reliable detection)
-    file_info = []
-    for f in DATA_FOLDER.glob("*.xlsx"):
-        if not f.name.startswith("~$"):
-            try:
-                stat = f.stat()
-                file_info.append((f.name, stat.st_mtime, stat.st_size))
-            except Exception as e:
-                logger.warning(f"Could not get file stats for {f.name}: {e}")
-                file_info.append((f.name, 0, 0))
-    # Sort by filename for consistent hashing
-    file_info_sorted = tuple(sorted(file_info))
-    current_file_hash = str(hash(file_info_sorted))
-    # Also include file count for better detection
-    current_file_hash = f"{current_file_hash}_{len(file_info)}"
-    
-    # Check if files have changed since last load
-    files_changed = (st.session_state.last_file_hash is None or 
-                     st.session_state.last_file_hash != current_file_hash)
+    # Only compute the full hash when the cheap signature says something changed
+    if refresh:
+        _folder_scan.clear()
+    cheap_sig, file_info = _folder_scan(str(DATA_FOLDER), DATA_FOLDER.stat().st_mtime_ns)
+    if st.session_state.last_file_hash is None or st.session_state.last_cheap_sig != cheap_sig:
+        st.session_state.last_file_hash = _inputs_fingerprint(file_info)
+        st.session_state.last_cheap_sig = cheap_sig
+    current_file_hash = st.session_state.last_file_hash
 else:
     current_file_hash = None
-    files_changed = False
 
-# Initialize cache version in session state
-if "cache_version" not in st.session_state:
-    st.session_state.cache_version = "v1"
+folder_path = str(DATA_FOLDER) if not use_google_drive else None
 
-# Update session state for refresh tracking
+# Load data - drop cached frames first if refresh was clicked
 if refresh:
     st.session_state.last_refresh_time = time.time()
-    st.session_state.last_file_hash = current_file_hash if DATA_FOLDER.exists() else None
-    st.session_state.pending_file_update = False
-    st.session_state.force_uncached_load = True
-elif files_changed:
-    # Files changed - clear cache and update version
-    load_all_files.clear()
-    if "cache_version" in st.session_state:
-        version_num = int(st.session_state.cache_version.replace("v", "")) if st.session_state.cache_version.replace("v", "").isdigit() else 0
-        st.session_state.cache_version = f"v{version_num + 1}"
-    else:
-        st.session_state.cache_version = f"v{int(time.time())}"
-    st.session_state.pending_file_update = True
-
-# Load data - use uncached version if refresh was clicked
-if refresh or st.session_state.get("force_uncached_load", False):
-    # Clear cache first
-    load_all_files.clear()
-    # Use uncached version to get fresh data
+    clear_loaded_files()
+    filter_options.clear()
+    date_bounds.clear()
+    aggregate_filtered.clear()
     with st.spinner("Loading data (fresh reload)..."):
-        folder_path = str(DATA_FOLDER) if not use_google_drive else None
-        df_all = _load_all_files_uncached(folder_path)
+        df_all = load_all_files(folder_path, current_file_hash)
     
     # Clear the refresh flag after loading
     st.session_state.refresh_requested = False
-    st.session_state.force_uncached_load = False
-    
-    # Update cache version so cached version also updates
-    if "cache_version" not in st.session_state:
-        st.session_state.cache_version = "v1"
-    try:
-        version_num = int(st.session_state.cache_version.replace("v", "")) if st.session_state.cache_version.replace("v", "").isdigit() else 0
-        st.session_state.cache_version = f"v{version_num + 1}"
-    except:
-        st.session_state.cache_version = f"v{int(time.time())}"
     
     st.success("✅ Data refreshed successfully!")
 else:
-    # Use cached version for normal operation
+    # Use cached data for normal operation; a new fingerprint loads fresh data automatically
     with st.spinner("Loading data..."):
-        folder_path = str(DATA_FOLDER) if not use_google_drive else None
-        df_all = load_all_files(folder_path, cache_version=st.session_state.cache_version)
-
-
-# Update file hash after successful load
-if not df_all.empty and current_file_hash:
-    if st.session_state.last_file_hash != current_file_hash:
-        st.session_state.last_file_hash = current_file_hash
-    st.session_state.pending_file_update = False
+        df_all = load_all_files(folder_path, current_file_hash)
 
 # Simple error message for empty data
 if df_all.empty:
@@ -1224,8 +1099,7 @@ if df_all.empty:
 st.sidebar.header("🔍 Filters")
 
 # Date range filter
-min_date = df_all["__date"].min()
-max_date = df_all["__date"].max()
+min_date, max_date = date_bounds(df_all, (folder_path, current_file_hash))
 if pd.notna(min_date) and pd.notna(max_date):
     date_range = st.sidebar.date_input(
         "📅 Date range",
@@ -1239,7 +1113,8 @@ else:
     st.sidebar.warning("⚠️ No valid dates found in files")
 
 # Sub Division filter
-subdivision_options = sorted(df_all["Sub Division"].dropna().unique().astype(str))
+options_by_col = filter_options(df_all, (folder_path, current_file_hash))
+subdivision_options = options_by_col["Sub Division"]
 selected_subdivisions = st.sidebar.multiselect(
     "🏢 Sub Division",
     options=subdivision_options,
@@ -1249,7 +1124,7 @@ selected_subdivisions = st.sidebar.multiselect(
 
 # Tehsil filter
 if "Tehsil/Sub Tehsil" in df_all.columns:
-    tehsil_options = sorted(df_all["Tehsil/Sub Tehsil"].dropna().unique().astype(str))
+    tehsil_options = options_by_col["Tehsil/Sub Tehsil"]
     selected_tehsils = st.sidebar.multiselect(
         "📍 Tehsil/Sub Tehsil",
         options=tehsil_options,
@@ -1260,7 +1135,7 @@ else:
     selected_tehsils = None
 
 # Officer filter
-officer_options = sorted(df_all["Officer"].dropna().unique().astype(str))
+officer_options = options_by_col["Officer"]
 selected_officers = st.sidebar.multiselect(
     "👤 Officer",
     options=officer_options,
@@ -1277,255 +1152,101 @@ group_by = st.sidebar.selectbox(
 )
 
 # Add JavaScript to auto-close multiselect dropdowns and mobile optimizations
-st.sidebar.markdown("""
+# One delegated click listener; the guard keeps reruns from stacking more listeners.
+# st.markdown strips <script>, so this goes through st.html, which only runs it with unsafe_allow_javascript
+st.sidebar.html("""
 <script>
 (function() {
-    // Enhanced function to close multiselect dropdowns
-    function closeAllDropdowns() {
-        try {
-            // Get the parent document (Streamlit runs in iframe)
-            const doc = window.parent !== window ? window.parent.document : document;
-            
-            // Method 1: Find and blur all active select inputs
-            const selectInputs = doc.querySelectorAll('[data-baseweb="select"] input, [data-baseweb="select"] [role="combobox"]');
-            selectInputs.forEach(input => {
-                if (input === doc.activeElement) {
-                    input.blur();
-                }
-            });
-            
-            // Method 2: Find open popovers and close them
-            const popovers = doc.querySelectorAll('[data-baseweb="popover"][data-is-open="true"], [data-baseweb="popover"]:not([style*="display: none"])');
-            popovers.forEach(popover => {
-                // Try to find and click the backdrop or trigger close
-                const backdrop = popover.closest('[data-baseweb="layer"]');
-                if (backdrop) {
-                    backdrop.style.display = 'none';
-                }
-            });
-            
-            // Method 3: Send ESC key to close any open dropdowns
-            const escEvent = new KeyboardEvent('keydown', {
-                key: 'Escape',
-                keyCode: 27,
-                bubbles: true,
-                cancelable: true
-            });
-            doc.activeElement?.dispatchEvent(escEvent);
-            doc.body.dispatchEvent(escEvent);
-            
-            // Method 4: Click outside on document body (fallback)
-            const clickOutside = new MouseEvent('mousedown', {
-                bubbles: true,
-                cancelable: true,
-                view: window.parent !== window ? window.parent : window
-            });
-            setTimeout(() => {
-                doc.body.dispatchEvent(clickOutside);
-            }, 50);
-            
-        } catch (e) {
-            console.log('Error closing dropdowns:', e);
-        }
+    // Get the parent window/document (Streamlit runs in iframe)
+    const win = window.parent !== window ? window.parent : window;
+    const doc = win.document;
+    if (win.__fcr_dd_installed) return;
+    win.__fcr_dd_installed = true;
+    
+    const idle = win.requestIdleCallback
+        ? (fn) => win.requestIdleCallback(fn, {timeout: 50})
+        : (fn) => setTimeout(fn, 50);
+    
+    function isMobile() {
+        return win.innerWidth <= 768;
     }
     
-    // Function to setup auto-close listeners
-    function setupAutoClose() {
-        const doc = window.parent !== window ? window.parent.document : document;
+    function handleClick(e) {
+        const target = e.target;
         
-        // More aggressive approach: Listen for clicks on multiselect options and immediately close
-        function handleOptionClick(e) {
-            const target = e.target;
-            const option = target.closest('[role="option"], [data-baseweb="option"], li[role="option"]');
-            
-            if (option) {
-                // Find the parent select input
-                const selectContainer = option.closest('[data-baseweb="select"]');
-                if (selectContainer) {
-                    // Find the input/combobox element
-                    const input = selectContainer.querySelector('input[role="combobox"], [role="combobox"]');
-                    if (input) {
-                        // Immediately blur to close dropdown
-                        setTimeout(() => {
-                            input.blur();
-                            // Also trigger ESC key
-                            const escEvent = new KeyboardEvent('keydown', {
-                                key: 'Escape',
-                                keyCode: 27,
-                                bubbles: true,
-                                cancelable: true
-                            });
-                            input.dispatchEvent(escEvent);
-                            // Click outside to ensure it closes
-                            doc.body.click();
-                        }, 100);
-                    }
-                }
+        // Close the multiselect dropdown once an option is picked
+        const option = target.closest('[role="option"], [data-baseweb="option"]');
+        if (option) {
+            const selectContainer = option.closest('[data-baseweb="select"]');
+            const input = selectContainer && selectContainer.querySelector('input[role="combobox"], [role="combobox"]');
+            if (input) {
+                idle(() => {
+                    input.blur();
+                    input.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27, bubbles: true, cancelable: true}));
+                });
             }
+            return;
         }
         
-        // Use capture phase to catch events early
-        doc.addEventListener('click', handleOptionClick, true);
-        doc.addEventListener('mousedown', handleOptionClick, true);
-        
-        // Also listen for mouseup on options (some browsers trigger this)
-        doc.addEventListener('mouseup', function(e) {
-            if (e.target.closest('[role="option"], [data-baseweb="option"]')) {
-                setTimeout(closeAllDropdowns, 200);
+        // Mobile-specific: close the sidebar when clicking on the main content area
+        if (isMobile() && target.closest('.main, [data-testid="stAppViewContainer"]') && !target.closest('[data-testid="stSidebar"]')) {
+            const sidebar = doc.querySelector('[data-testid="stSidebar"]');
+            const sidebarToggle = doc.querySelector('[data-testid="stSidebar"] button');
+            if (sidebar && sidebarToggle && sidebar.getAttribute('aria-expanded') === 'true') {
+                sidebarToggle.click();
             }
-        }, true);
-        
-        // Listen for changes in select elements using MutationObserver
-        const observer = new MutationObserver(function(mutations) {
-            mutations.forEach(function(mutation) {
-                // When attributes change on select elements
-                if (mutation.type === 'attributes') {
-                    const target = mutation.target;
-                    // Check if it's a select element that just opened
-                    if (target.hasAttribute && target.hasAttribute('data-baseweb')) {
-                        // Check all selects and close any that should be closed
-                        setTimeout(() => {
-                            const openSelects = doc.querySelectorAll('[data-baseweb="select"] input[aria-expanded="true"]');
-                            openSelects.forEach(select => {
-                                // If it's not being hovered, we can try to close it
-                                const popover = select.closest('[data-baseweb="select"]')?.querySelector('[data-baseweb="popover"]');
-                                if (popover && !popover.matches(':hover')) {
-                                    setTimeout(() => select.blur(), 300);
-                                }
-                            });
-                        }, 500);
-                    }
-                }
-            });
-        });
-        
-        // Observe the entire document for changes
-        observer.observe(doc.body, {
-            childList: true,
-            subtree: true,
-            attributes: true,
-            attributeFilter: ['aria-expanded', 'data-is-open', 'style']
-        });
-    }
-    
-    // Wait for DOM to be ready
-    if (document.readyState === 'loading') {
-        document.addEventListener('DOMContentLoaded', setupAutoClose);
-    } else {
-        setupAutoClose();
-    }
-    
-    // Also setup when Streamlit reruns (iframe context)
-    if (window.parent !== window) {
-        const parentDoc = window.parent.document;
-        if (parentDoc.readyState === 'loading') {
-            parentDoc.addEventListener('DOMContentLoaded', setupAutoClose);
-        } else {
-            setTimeout(setupAutoClose, 500); // Delay to ensure Streamlit has rendered
-        }
-    }
-    
-    // Mobile-specific: Close sidebar when clicking outside on mobile
-    function isMobile() {
-        return window.innerWidth <= 768 || (window.parent !== window && window.parent.innerWidth <= 768);
-    }
-    
-    if (isMobile()) {
-        const doc = window.parent !== window ? window.parent.document : document;
-        // Close sidebar when clicking on main content area
-        const mainContent = doc.querySelector('.main, [data-testid="stAppViewContainer"]');
-        if (mainContent) {
-            mainContent.addEventListener('click', function(e) {
-                const sidebar = doc.querySelector('[data-testid="stSidebar"]');
-                const sidebarToggle = doc.querySelector('[data-testid="stSidebar"] button');
-                if (sidebar && sidebarToggle && sidebar.getAttribute('aria-expanded') === 'true') {
-                    // Don't close if clicking on sidebar itself
-                    if (!e.target.closest('[data-testid="stSidebar"]')) {
-                        sidebarToggle.click();
-                    }
-                }
-            });
         }
     }
     
-    // Re-run setup after Streamlit reruns (important for multiselect auto-close)
-    if (window.parent !== window) {
-        // Streamlit reruns cause iframe reloads, so we need to re-setup
-        const observer = new MutationObserver(function() {
-            setTimeout(setupAutoClose, 300);
-        });
-        const parentBody = window.parent.document.body;
-        if (parentBody) {
-            observer.observe(parentBody, {
-                childList: true,
-                subtree: true
-            });
-        }
-    }
+    // Capture phase catches option clicks before the select handles them
+    doc.addEventListener('click', handleClick, {capture: true, passive: true});
 })();
 </script>
-""", unsafe_allow_html=True)
+""", unsafe_allow_javascript=True)
 
 # Developer credit in sidebar
 st.sidebar.divider()
-st.sidebar.markdown(
-    "<div style='text-align: center; padding: 15px 0;'>"
-    "<p style='margin: 0; color: #666; font-size: 0.85em; line-height: 1.5;'>"
-    "Developed by<br>"
-    "<strong style='color: #1f77b4; font-size: 1.1em;'>Shivam Gulati</strong><br>"
-    "<span style='font-size: 0.8em;'>Land Revenue Fellow</span>"
-    "</p>"
-    "<div style='margin-top: 15px; padding-top: 15px; border-top: 1px solid #e0e0e0;'>"
-    "<p style='margin: 0 0 10px 0; color: #666; font-size: 0.75em; font-weight: 600; text-align: center;'>In case of Glitches</p>"
-    "<div style='display: flex; flex-direction: column; gap: 8px; align-items: center; justify-content: center;'>"
-    "<div style='display: flex; align-items: center; justify-content: center; gap: 8px;'>"
-    "<span style='font-size: 1em;'>📧</span>"
-    "<a href='mailto:Shivamgulati137@gmail.com' style='color: #1f77b4; text-decoration: none; font-size: 0.75em; word-break: break-word;'>Shivamgulati137@gmail.com</a>"
-    "</div>"
-    "<div style='display: flex; align-items: center; justify-content: center; gap: 8px;'>"
-    "<span style='font-size: 1em;'>📱</span>"
-    "<span style='color: #666; font-size: 0.75em;'>62844-12362</span>"
-    "</div>"
-    "</div>"
-    "</div>"
-    "</div>",
-    unsafe_allow_html=True
-)
+st.sidebar.markdown(DEVELOPER_HTML, unsafe_allow_html=True)
 
-# Apply filters
-df = df_all.copy()
+# Apply filters - build one row mask over df_all and slice once at the end
+mask = np.ones(len(df_all), dtype=np.bool_)
 filter_applied = False
 
 if date_range and len(date_range) == 2:
-    start, end = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
-    df = df[(df["__date"] >= start) & (df["__date"] <= end)]
+    # Compare as datetime64 on the raw array; the end bound covers the whole last day
+    start_ns = np.datetime64(date_range[0], "ns")
+    end_ns = np.datetime64(date_range[1], "ns") + np.timedelta64(1, "D") - np.timedelta64(1, "ns")
+    date_values = df_all["__date"].to_numpy()
+    mask &= (date_values >= start_ns) & (date_values <= end_ns)
     filter_applied = True
 
 if selected_subdivisions:
-    df = df[df["Sub Division"].astype(str).isin(selected_subdivisions)]
+    mask &= category_mask(df_all["Sub Division"], selected_subdivisions)
     filter_applied = True
 
-if selected_tehsils and "Tehsil/Sub Tehsil" in df.columns:
-    df = df[df["Tehsil/Sub Tehsil"].astype(str).isin(selected_tehsils)]
+if selected_tehsils and "Tehsil/Sub Tehsil" in df_all.columns:
+    mask &= category_mask(df_all["Tehsil/Sub Tehsil"], selected_tehsils)
     filter_applied = True
 
 if selected_officers:
-    df = df[df["Officer"].astype(str).isin(selected_officers)]
+    mask &= category_mask(df_all["Officer"], selected_officers)
     filter_applied = True
 
-# Aggregate for visuals
-agg_by_sub = df.groupby(["__date", "Sub Division"], as_index=False)["Total"].sum()
-latest_date = df["__date"].max()
-latest_snapshot = df[df["__date"] == latest_date].copy() if pd.notna(latest_date) else pd.DataFrame()
+df = df_all[mask] if filter_applied else df_all
 
-# Calculate previous period for comparison
-previous_date = None
-previous_snapshot = pd.DataFrame()
-if not df.empty and pd.notna(latest_date):
-    previous_date_options = df[df["__date"] < latest_date]["__date"].unique()
-    if len(previous_date_options) > 0:
-        previous_date = pd.to_datetime(previous_date_options.max())
-        previous_snapshot = df[df["__date"] == previous_date].copy()
+# Aggregate for visuals - cached per (loaded inputs, filter selections)
+filter_key = (
+    tuple(date_range) if date_range else (),
+    tuple(selected_subdivisions or ()),
+    tuple(selected_tehsils or ()),
+    tuple(selected_officers or ()),
+)
+aggregates = aggregate_filtered(df, (folder_path, current_file_hash), filter_key)
+agg_by_sub = aggregates["agg_by_sub"]
+latest_date = aggregates["latest_date"]
+previous_date = aggregates["previous_date"]
+snapshot_grouped = aggregates["snapshot_grouped"]
+latest_snapshot = df[df["__date"] == latest_date] if pd.notna(latest_date) else pd.DataFrame()
 
 # ========== EXECUTIVE DASHBOARD ==========
 st.header("📊 Brief Overview")
@@ -1533,55 +1254,32 @@ st.header("📊 Brief Overview")
 if latest_snapshot.empty:
     st.warning("No data available for the selected date range/filters.")
 else:
-    # Ensure Total is numeric before all calculations
-    latest_snapshot_clean = latest_snapshot.copy()
-    latest_snapshot_clean["Total"] = pd.to_numeric(latest_snapshot_clean["Total"], errors="coerce").fillna(0).astype(float)
-    
-    previous_snapshot_clean = previous_snapshot.copy() if not previous_snapshot.empty else pd.DataFrame()
-    if not previous_snapshot_clean.empty:
-        previous_snapshot_clean["Total"] = pd.to_numeric(previous_snapshot_clean["Total"], errors="coerce").fillna(0).astype(float)
-    
     # Calculate key metrics - use grouped data for consistency
-    snapshot_grouped = latest_snapshot_clean.groupby("Sub Division", as_index=False)["Total"].sum()
-    snapshot_grouped["Total"] = pd.to_numeric(snapshot_grouped["Total"], errors="coerce").fillna(0).astype(float)
-    total_latest = float(snapshot_grouped["Total"].sum())
-    
-    # Calculate previous total from grouped data
-    if not previous_snapshot_clean.empty:
-        previous_grouped = previous_snapshot_clean.groupby("Sub Division", as_index=False)["Total"].sum()
-        previous_grouped["Total"] = pd.to_numeric(previous_grouped["Total"], errors="coerce").fillna(0).astype(float)
-        total_previous = float(previous_grouped["Total"].sum())
-    else:
-        total_previous = 0.0
+    # Per-date totals are already aggregated and sorted by date; the last two are the latest and previous periods
+    total_trend = aggregates["total_trend"]
+    total_latest = float(total_trend["Total"].iloc[-1])
+    total_previous = float(total_trend["Total"].iloc[-2]) if previous_date is not None else 0.0
     
     total_change = calculate_change(total_latest, total_previous)
     
-    num_subdivisions = latest_snapshot_clean["Sub Division"].nunique()
-    num_officers = latest_snapshot_clean["Officer"].nunique()
+    # snapshot_grouped has one row per sub-division present in the latest period
+    num_subdivisions = len(snapshot_grouped)
+    num_officers = latest_snapshot["Officer"].nunique()
+    
+    # Alerts - filter the per-subdivision totals by threshold
+    # This ensures we count sub-divisions based on their total pendency, not individual officer levels
+    alert_df = snapshot_grouped[snapshot_grouped["Total"] > threshold]
     
     # Top 3 sub-divisions - sort grouped data
     snapshot_grouped = snapshot_grouped.sort_values("Total", ascending=False, ignore_index=True)
     top3_subdivisions = snapshot_grouped.head(3)
-    
-    # Alerts - group by Sub Division FIRST, then filter by threshold
-    # This ensures we count sub-divisions based on their total pendency, not individual officer levels
-    alerts_grouped = latest_snapshot_clean.groupby("Sub Division", as_index=False)["Total"].sum()
-    alerts_grouped["Total"] = pd.to_numeric(alerts_grouped["Total"], errors="coerce").fillna(0).astype(float)
-    alert_df = alerts_grouped[alerts_grouped["Total"] > threshold]
     num_alerts = len(alert_df) if not alert_df.empty else 0
     
-    # Top pendency type - use cleaned snapshot
-    pendency_columns = [
-        "Uncontested Pendency", "Income Certificate", "Copying Service",
-        "Inspection Records", "Overdue Mortgage", "Overdue Court Orders",
-        "Overdue Fardbadars"
-    ]
-    available_pendency_cols = [col for col in pendency_columns if col in latest_snapshot_clean.columns]
-    pendency_totals = {}
-    for col in available_pendency_cols:
-        # Convert to numeric and sum
-        pendency_totals[col] = float(pd.to_numeric(latest_snapshot_clean[col], errors="coerce").fillna(0).sum())
-    top_pendency_type = max(pendency_totals.items(), key=lambda x: x[1]) if pendency_totals else ("N/A", 0)
+    # Top pendency type
+    available_pendency_cols = [col for col in PENDENCY_COLUMNS if col in latest_snapshot.columns]
+    pendency_sums = aggregates["pendency_sums"]
+    pendency_totals = pendency_sums.to_dict()
+    top_pendency_type = (pendency_sums.idxmax(), pendency_sums.max()) if pendency_totals else ("N/A", 0)
     
     # Key Metrics Row - Clean
     col1, col2, col3 = st.columns(3)
@@ -1611,8 +1309,10 @@ else:
         # Sort pendency types by value (descending)
         sorted_pendencies = sorted(pendency_totals.items(), key=lambda x: x[1], reverse=True)
         
-        # Color gradient from light to dark (YlOrRd scale)
-        colors = ['#ffffcc', '#ffeda0', '#fed976', '#feb24c', '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026', '#800026']
+        # Share of total and color level for every card at once
+        pendency_values = np.array([value for _, value in sorted_pendencies], dtype=np.float64)
+        pendency_pcts = pendency_values / total_latest * 100 if total_latest > 0 else np.zeros_like(pendency_values)
+        color_levels = np.minimum((pendency_pcts / 15).astype(np.int32), len(PENDENCY_CARD_COLORS) - 1)
         
         # Display in organized card layout
         num_pendencies = len(sorted_pendencies)
@@ -1623,36 +1323,20 @@ else:
             cols = st.columns(len(row_pendencies))
             
             for col_idx, (pendency_type, pendency_value) in enumerate(row_pendencies):
+                card_idx = i + col_idx
+                level = color_levels[card_idx]
                 with cols[col_idx]:
-                    pct_of_total = (pendency_value / total_latest * 100) if total_latest > 0 else 0
-                    
-                    # Determine color based on percentage (darker for higher values)
-                    color_idx = min(int(pct_of_total / 15), len(colors) - 1) if total_latest > 0 else 0
-                    bg_color = colors[color_idx]
-                    text_color = '#000000' if color_idx < 4 else '#ffffff'
-                    
                     # Create compact styled card
                     st.markdown(
-                        f"""
-                        <div style="
-                            background: linear-gradient(135deg, {bg_color} 0%, {colors[min(color_idx+1, len(colors)-1)]} 100%);
-                            padding: 0.6rem 0.8rem;
-                            border-radius: 6px;
-                            border-left: 3px solid {colors[min(color_idx+2, len(colors)-1)]};
-                            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                            margin-bottom: 0.5rem;
-                        ">
-                            <h4 style="color: {text_color}; margin: 0 0 0.3rem 0; font-size: 0.8rem; font-weight: 600; line-height: 1.2;">
-                                {pendency_type}
-                            </h4>
-                            <p style="color: {text_color}; margin: 0; font-size: 1.2rem; font-weight: 700; line-height: 1.2;">
-                                {format_number(pendency_value)}
-                            </p>
-                            <p style="color: {text_color}; margin: 0.15rem 0 0 0; font-size: 0.75rem; opacity: 0.9; line-height: 1.2;">
-                                {pct_of_total:.1f}%
-                            </p>
-                        </div>
-                        """,
+                        PENDENCY_CARD_HTML.format(
+                            bg=PENDENCY_CARD_COLORS[level],
+                            bg_end=PENDENCY_CARD_GRADIENT_END[level],
+                            border=PENDENCY_CARD_BORDER[level],
+                            text=PENDENCY_CARD_TEXT[level],
+                            label=pendency_type,
+                            value=format_number(pendency_value),
+                            pct=pendency_pcts[card_idx],
+                        ),
                         unsafe_allow_html=True
                     )
     
@@ -1667,152 +1351,93 @@ else:
             # Define distinct colors for top 3 (Gold, Silver, Bronze)
             subdivision_colors = ["#FFD700", "#C0C0C0", "#CD7F32"]  # Gold, Silver, Bronze
             
-            for rank_idx, (idx, row) in enumerate(top3_subdivisions.iterrows()):
-                subdiv = row["Sub Division"]
-                total_val = int(row["Total"])
-                pct_of_total = (total_val / total_latest * 100) if total_latest > 0 else 0
-                progress_color = subdivision_colors[rank_idx] if rank_idx < 3 else subdivision_colors[2]
-                
-                # Calculate change for this sub-division
-                prev_val = 0
-                if not previous_snapshot.empty:
-                    prev_subdiv = previous_snapshot[previous_snapshot["Sub Division"] == subdiv]
-                    prev_val = int(prev_subdiv["Total"].sum()) if not prev_subdiv.empty else 0
-                subdiv_change = calculate_change(total_val, prev_val)
-                
-                
-                col_metric, col_bar = st.columns([3, 2])
-                with col_metric:
-                    st.markdown(f"<p style='font-weight: 600; color: #003366; margin: 0.25rem 0; font-size: 1rem;'>{subdiv}</p>", unsafe_allow_html=True)
-                    st.markdown(f"<p style='font-size: 1rem; color: #333; margin: 0.25rem 0;'><strong>{format_number(total_val)}</strong> <span style='color: #666; font-size: 0.85rem;'>({pct_of_total:.1f}% of total)</span></p>", unsafe_allow_html=True)
-                    if previous_date:
-                        change_icon = get_trend_icon(subdiv_change)
-                        change_color = "#dc3545" if subdiv_change > 0 else "#28a745"
-                        st.markdown(f"<p style='color: {change_color}; font-size: 0.85rem; margin: 0.25rem 0;'>{change_icon} {subdiv_change:+.1f}% vs previous</p>", unsafe_allow_html=True)
-                with col_bar:
-                    # Custom colored progress bar
-                    progress_value = min(pct_of_total / 100, 1.0)
-                    st.markdown(
-                        f"""
-                        <div style="
-                            width: 100%;
-                            height: 1.5rem;
-                            background-color: #e0e0e0;
-                            border-radius: 0.25rem;
-                            overflow: hidden;
-                            margin-top: 0.5rem;
-                        ">
-                            <div style="
-                                width: {progress_value * 100}%;
-                                height: 100%;
-                                background-color: {progress_color};
-                                transition: width 0.3s ease;
-                            "></div>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
+            # Totals, shares and previous-period values for all three at once
+            top3_totals = top3_subdivisions["Total"].to_numpy(dtype=np.int64)
+            top3_pcts = top3_totals / total_latest * 100 if total_latest > 0 else np.zeros(len(top3_totals))
+            top3_prev = top3_subdivisions["Previous Total"].to_numpy(dtype=np.int64)
+            
+            # Render all rows as one HTML block instead of a columns pair and several markdown calls per row
+            rows_html = []
+            for rank_idx, subdiv in enumerate(top3_subdivisions["Sub Division"]):
+                total_val = int(top3_totals[rank_idx])
+                pct_of_total = top3_pcts[rank_idx]
+                subdiv_change = calculate_change(total_val, int(top3_prev[rank_idx]))
+                change_html = ""
+                if previous_date:
+                    change_color = "#dc3545" if subdiv_change > 0 else "#28a745"
+                    change_html = TOP_SUBDIVISION_CHANGE_HTML.format(
+                        color=change_color, icon=get_trend_icon(subdiv_change), change=subdiv_change
                     )
+                rows_html.append(TOP_SUBDIVISION_ROW_HTML.format(
+                    subdiv=subdiv,
+                    total=format_number(total_val),
+                    pct=pct_of_total,
+                    change=change_html,
+                    bar_pct=min(pct_of_total / 100, 1.0) * 100,
+                    bar_color=subdivision_colors[min(rank_idx, 2)],
+                ))
+            st.markdown(
+                "<div style='display: flex; flex-direction: column; gap: 0.5rem;'>" + "".join(rows_html) + "</div>",
+                unsafe_allow_html=True
+            )
         else:
             st.info("No data available")
         
         # Top Officers with Most Pendencies
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("### 👤 Top 5 Officers by Pendency")
-        if not latest_snapshot_clean.empty:
+        if not latest_snapshot.empty:
             # Sort by Total descending and take top 5 rows
             # Each row represents a unique officer-location combination
-            top_officers = latest_snapshot_clean.nlargest(5, "Total")
+            top_officers = latest_snapshot.nlargest(5, "Total")
             
             if not top_officers.empty:
+                officer_history = officer_history_index(df, (folder_path, current_file_hash), filter_key)
+                
                 # Define distinct colors for top 5 officers
                 officer_colors = ["#FF6B6B", "#4ECDC4", "#95E1D3", "#F38181", "#AA96DA"]  # Red, Teal, Mint, Coral, Purple
                 
-                # Display in clean format
-                for rank_idx, (idx, row) in enumerate(top_officers.iterrows()):
-                    officer = row["Officer"]
-                    officer_total = int(row["Total"])
-                    subdiv = row.get("Sub Division", "Unknown")
-                    tehsil = row.get("Tehsil/Sub Tehsil", "N/A") if pd.notna(row.get("Tehsil/Sub Tehsil", None)) else "N/A"
-                    pct_of_total = (officer_total / total_latest * 100) if total_latest > 0 else 0
-                    progress_color = officer_colors[rank_idx] if rank_idx < 5 else officer_colors[4]
-
-                    # Build historical trend for this officer using the filtered dataframe df
-                    officer_mask = (df["Officer"].astype(str) == str(officer)) & (df["Sub Division"].astype(str) == str(subdiv))
-                    if "Tehsil/Sub Tehsil" in df.columns and pd.notna(row.get("Tehsil/Sub Tehsil", None)):
-                        officer_mask = officer_mask & (df["Tehsil/Sub Tehsil"].astype(str) == str(tehsil))
-                    officer_history = df[officer_mask].copy()
-
-                    officer_trend = pd.DataFrame()
-                    if not officer_history.empty and "__date" in officer_history.columns:
-                        officer_trend = (
-                            officer_history.groupby("__date", as_index=False)["Total"]
-                            .sum()
-                            .sort_values("__date")
-                        )
+                # Totals and shares for all five at once
+                officer_totals = top_officers["Total"].to_numpy(dtype=np.int64)
+                officer_pcts = officer_totals / total_latest * 100 if total_latest > 0 else np.zeros(len(officer_totals))
+                tehsil_values = (
+                    top_officers["Tehsil/Sub Tehsil"].astype(object).to_numpy()
+                    if "Tehsil/Sub Tehsil" in top_officers.columns else np.full(len(top_officers), None)
+                )
+                
+                # Render all rows as one HTML block instead of a columns pair and several markdown calls per row
+                rows_html = []
+                for rank_idx, (subdiv, tehsil_key, officer) in enumerate(
+                    zip(top_officers["Sub Division"], tehsil_values, top_officers["Officer"])
+                ):
+                    tehsil_key = tehsil_key if pd.notna(tehsil_key) else None
+                    pct_of_total = officer_pcts[rank_idx]
+                    progress_color = officer_colors[min(rank_idx, 4)]
+
+                    # Historical trend for this officer, sliced from the cached per-officer history
+                    officer_trend_df = officer_trend(officer_history, subdiv, tehsil_key, officer)
 
-                    col_officer, col_officer_right = st.columns([3, 2])
-                    with col_officer:
-                        st.markdown(
-                            f"<p style='font-size: 0.95rem; font-weight: 600; color: #003366; margin: 0.25rem 0;'><strong>{subdiv}</strong> - <strong>{tehsil}</strong> - <strong>{officer}</strong></p>",
-                            unsafe_allow_html=True,
+                    # Show a minimalist inline SVG trend when we have data; otherwise fall back to colored bar
+                    if not officer_trend_df.empty and officer_trend_df["Total"].sum() > 0:
+                        spark_x, spark_y = lttb(
+                            officer_trend_df["__date"].to_numpy(),
+                            officer_trend_df["Total"].to_numpy(dtype="int32"),
+                            SPARKLINE_MAX_POINTS,
                         )
-                        st.markdown(
-                            f"<p style='font-size: 1rem; color: #333; margin: 0.25rem 0;'><strong>{format_number(officer_total)}</strong> <span style='color: #666; font-size: 0.85rem;'>({pct_of_total:.1f}% of total)</span></p>",
-                            unsafe_allow_html=True,
+                        trend_html = sparkline_svg(spark_x, spark_y, progress_color)
+                    else:
+                        trend_html = TOP_OFFICER_BAR_HTML.format(
+                            bar_pct=min(pct_of_total / 100, 1.0) * 100, bar_color=progress_color
                         )
-                    with col_officer_right:
-                        # Show a minimalist trend chart when we have data; otherwise fall back to colored bar
-                        if not officer_trend.empty and officer_trend["Total"].sum() > 0:
-                            fig_officer = px.line(
-                                officer_trend,
-                                x="__date",
-                                y="Total",
-                                markers=True,
-                                color_discrete_sequence=[progress_color],
-                            )
-                            fig_officer.update_traces(line=dict(width=2), marker=dict(size=5))
-                            fig_officer.update_layout(
-                                height=120,
-                                margin=dict(l=10, r=10, t=10, b=10),
-                                showlegend=False,
-                                xaxis_title=None,
-                                yaxis_title=None,
-                                plot_bgcolor="rgba(0,0,0,0)",
-                                paper_bgcolor="rgba(0,0,0,0)",
-                            )
-                            fig_officer.update_xaxes(showgrid=False, showticklabels=False)
-                            fig_officer.update_yaxes(rangemode="tozero", showgrid=False, showticklabels=False)
-                            st.plotly_chart(
-                                fig_officer,
-                                width='stretch',
-                                config={
-                                    "displayModeBar": False,
-                                    "displaylogo": False,
-                                },
-                            )
-                        else:
-                            # Custom colored progress bar (fallback when no trend data)
-                            progress_value = min(pct_of_total / 100, 1.0)
-                            st.markdown(
-                                f"""
-                                <div style="
-                                    width: 100%;
-                                    height: 1.5rem;
-                                    background-color: #e0e0e0;
-                                    border-radius: 0.25rem;
-                                    overflow: hidden;
-                                    margin-top: 0.5rem;
-                                ">
-                                    <div style="
-                                        width: {progress_value * 100}%;
-                                        height: 100%;
-                                        background-color: {progress_color};
-                                        transition: width 0.3s ease;
-                                    "></div>
-                                </div>
-                                """,
-                                unsafe_allow_html=True,
-                            )
+                    rows_html.append(TOP_OFFICER_ROW_HTML.format(
+                        subdiv=subdiv,
+                        tehsil=tehsil_key if tehsil_key is not None else "N/A",
+                        officer=officer,
+                        total=format_number(officer_totals[rank_idx]),
+                        pct=pct_of_total,
+                        trend=trend_html,
+                    ))
+                st.markdown("".join(rows_html), unsafe_allow_html=True)
             else:
                 st.info("No officer data available")
         else:
@@ -1834,12 +1459,13 @@ else:
         # Top alert sub-division - clear styling
         # alert_df is already grouped and filtered, so we can use it directly
         if not alert_df.empty:
-            # Sort by Total to get the highest alert (already numeric from grouping)
-            top_alert = alert_df.sort_values("Total", ascending=False, ignore_index=True).head(1)
-            if not top_alert.empty:
-                st.markdown(f"<p style='font-weight: 600; color: #003366; margin: 0.5rem 0;'>Highest Alert:</p>", unsafe_allow_html=True)
-                st.markdown(f"<p style='font-size: 1rem; font-weight: 600; color: #333; margin: 0.5rem 0;'>{top_alert.iloc[0]['Sub Division']}</p>", unsafe_allow_html=True)
-                st.markdown(f"<p style='font-size: 1.2rem; font-weight: 700; color: #003366; margin: 0.5rem 0;'>{format_number(int(top_alert.iloc[0]['Total']))}</p>", unsafe_allow_html=True)
+            # Single argmax pass over the (already numeric) totals instead of sorting the frame
+            top_alert_pos = int(alert_df["Total"].to_numpy().argmax())
+            top_alert_subdiv = alert_df["Sub Division"].iat[top_alert_pos]
+            top_alert_total = int(alert_df["Total"].iat[top_alert_pos])
+            st.markdown(f"<p style='font-weight: 600; color: #003366; margin: 0.5rem 0;'>Highest Alert:</p>", unsafe_allow_html=True)
+            st.markdown(f"<p style='font-size: 1rem; font-weight: 600; color: #333; margin: 0.5rem 0;'>{top_alert_subdiv}</p>", unsafe_allow_html=True)
+            st.markdown(f"<p style='font-size: 1.2rem; font-weight: 700; color: #003366; margin: 0.5rem 0;'>{format_number(top_alert_total)}</p>", unsafe_allow_html=True)
         else:
             st.markdown("""
             <div style="background-color: #f0fff4; padding: 1.25rem; border: 1px solid #c3e6cb; border-left: 4px solid #28a745; border-radius: 4px;">
@@ -1854,33 +1480,27 @@ else:
     
     with col_viz1:
         st.markdown("### 📈 Trend Overview")
-        total_trend = agg_by_sub.groupby("__date", as_index=False)["Total"].sum().sort_values("__date")
-
-        # Limit to last 7 available dates for readability
-        if not total_trend.empty:
-            unique_dates = total_trend["__date"].dropna().unique()
-            last_7_dates = unique_dates[-7:]
-            total_trend = total_trend[total_trend["__date"].isin(last_7_dates)]
+        # Limit to last 7 available dates for readability (one row per date, already in date order)
+        total_trend = total_trend.tail(7)
 
         if not total_trend.empty and len(total_trend) > 1:
-            fig_trend = px.line(
-                total_trend, x="__date", y="Total", markers=True,
-                title="District Total Trend",
-                color_discrete_sequence=['#1f77b4']
-            )
-            fig_trend.add_scatter(
-                x=total_trend["__date"], y=total_trend["Total"],
-                mode='lines+markers', name='Trend',
-                line=dict(width=3, color='#1f77b4'),
-                marker=dict(size=8, color='#1f77b4')
+            trend_x = total_trend["__date"].to_numpy()
+            trend_y = total_trend["Total"].to_numpy(dtype="int32")
+            fig_trend = go.Figure(
+                go.Scatter(
+                    x=trend_x, y=trend_y, mode='lines+markers', name='Trend',
+                    line=dict(width=3, color='#1f77b4'), marker=dict(size=8, color='#1f77b4')
+                )
             )
             fig_trend.update_layout(
+                title="District Total Trend",
                 height=300,
                 showlegend=False,
                 xaxis_title="Date",
                 yaxis_title="Total Pendency",
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)',
+                uirevision="fcr_dashboard",  # keep zoom/hover state across reruns instead of re-laying out
                 autosize=True,
                 margin=dict(l=50, r=20, t=30, b=50),
                 xaxis=dict(
@@ -1889,7 +1509,7 @@ else:
                 ),
                 yaxis=dict(
                     gridcolor='rgba(128,128,128,0.2)',
-                    dtick=200,
+                    dtick=nice_dtick(trend_y.max()),  # 200 as before, widened only when it would exceed TREND_Y_MAX_TICKS
                     rangemode="tozero"
                 )
             )
@@ -1902,7 +1522,7 @@ else:
         if not snapshot_grouped.empty:
             # Prepare data for bar chart - show all or top 10, whichever is less
             num_to_show = min(10, len(snapshot_grouped))
-            chart_data = snapshot_grouped.head(num_to_show).copy()
+            chart_data = snapshot_grouped.head(num_to_show)
             
             # Dynamic title based on actual number of sub-divisions
             if len(snapshot_grouped) <= 10:
@@ -1911,14 +1531,19 @@ else:
                 chart_title = f"Top {num_to_show} Sub Divisions"
             
             # Create a more visual bar chart
-            fig_dist = px.bar(
-                chart_data, 
-                x="Sub Division", 
-                y="Total",
-                title=chart_title,
-                color="Total",
-                color_continuous_scale="Reds",
-                text="Total"
+            dist_y = chart_data["Total"].to_numpy(dtype="int32")
+            fig_dist = go.Figure(
+                go.Bar(
+                    x=chart_data["Sub Division"].astype(str).to_numpy(),
+                    y=dist_y,
+                    text=dist_y,
+                    marker=dict(
+                        color=dist_y,
+                        colorscale="Reds",
+                        showscale=True,
+                        colorbar=dict(title="Total")
+                    )
+                )
             )
             
             # Format text labels
@@ -1942,6 +1567,7 @@ else:
                 yaxis_title="Total Pendency",
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)',
+                uirevision="fcr_dashboard",  # keep zoom/hover state across reruns instead of re-laying out
                 autosize=True,
                 margin=dict(l=60, r=40, t=50, b=100),
                 xaxis=dict(
@@ -1960,6 +1586,7 @@ else:
                     showgrid=True
                 ),
                 title=dict(
+                    text=chart_title,
                     font=dict(size=14),
                     x=0.5,
                     xanchor='center'
@@ -1971,49 +1598,51 @@ else:
             st.info("No data available")
     
     # Heatmap: Sub Division vs Pendency Types
-    if available_pendency_cols and not latest_snapshot_clean.empty:
+    if available_pendency_cols and not latest_snapshot.empty:
         st.markdown("### 🔥 Heatmap: Sub Division vs Pendency Types")
-        heatmap_data = []
-        for subdiv in latest_snapshot_clean["Sub Division"].dropna().unique()[:15]:  # Top 15
-            subdiv_df = latest_snapshot_clean[latest_snapshot_clean["Sub Division"] == subdiv]
-            row = {"Sub Division": subdiv}
-            for pcol in available_pendency_cols:
-                # Convert to numeric before summing
-                row[pcol] = float(pd.to_numeric(subdiv_df[pcol], errors="coerce").fillna(0).sum())
-            heatmap_data.append(row)
+        heatmap_df = aggregates["heatmap_df"]
         
+        # Built on demand: Streamlit runs (and ships) every figure on each rerun, even inside a collapsed expander,
+        # so the heatmap is only drawn once the user asks for it, and skipped when there is nothing to colour
+        show_heatmap = st.toggle("Show heatmap", value=False, key="show_heatmap")
+        if show_heatmap and not heatmap_df.empty and not heatmap_df.to_numpy().any():
+            st.info("All pendency counts are zero for the selected filters.")
         # Create heatmap once after collecting all data
-        if heatmap_data:
-            heatmap_df = pd.DataFrame(heatmap_data)
-            heatmap_df = heatmap_df.set_index("Sub Division")
-            
+        elif show_heatmap and not heatmap_df.empty:
             # Create heatmap with better color contrast
-            fig_heatmap = px.imshow(
-                heatmap_df.T,
-                labels=dict(x="Sub Division", y="Pendency Type", color="Count"),
-                aspect="auto",
-                color_continuous_scale="YlOrRd",  # Light (yellow) to Dark (red) - light for low, dark for high
-                title="Pendency Hotspots by Type and Sub Division",
-                text_auto=True
+            heatmap_t = heatmap_df.T
+            fig_heatmap = go.Figure(
+                go.Heatmap(
+                    z=heatmap_t.to_numpy(),
+                    x=heatmap_t.columns.astype(str).to_numpy(),
+                    y=heatmap_t.index.to_numpy(),
+                    colorscale="YlOrRd",  # Light (yellow) to Dark (red) - light for low, dark for high
+                    texttemplate="%{z}",
+                    hovertemplate="Sub Division: %{x}<br>Pendency Type: %{y}<br>Count: %{z}<extra></extra>",
+                    # Add colorbar title for clarity
+                    colorbar=dict(title="Pendency Count")
+                )
             )
             fig_heatmap.update_layout(
+                title="Pendency Hotspots by Type and Sub Division",
+                xaxis_title="Sub Division",
+                yaxis=dict(title="Pendency Type", autorange="reversed"),
                 height=400,
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)',
+                uirevision="fcr_dashboard",  # keep zoom/hover state across reruns instead of re-laying out
                 autosize=True,
                 margin=dict(l=100, r=20, t=40, b=100)
             )
-            # Add colorbar title for clarity
-            fig_heatmap.update_coloraxes(colorbar_title="Pendency Count")
             st.plotly_chart(fig_heatmap, use_container_width=True, config={'displayModeBar': False, 'responsive': True})
                 
     # Complete Summary Table
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("### 📋 Complete Summary Table")
     
-    if not latest_snapshot_clean.empty:
+    if not latest_snapshot.empty:
         # Add toggle to group by Tehsil
-        has_tehsil_col = "Tehsil/Sub Tehsil" in latest_snapshot_clean.columns
+        has_tehsil_col = "Tehsil/Sub Tehsil" in latest_snapshot.columns
         
         if has_tehsil_col:
             view_option = st.radio(
@@ -2025,38 +1654,23 @@ else:
         else:
             view_option = "Officer Level"
         
-        # Create comprehensive summary table - use cleaned snapshot
+        # Create comprehensive summary table from the latest snapshot
         if view_option == "Tehsil Level" and has_tehsil_col:
-            # Group by Tehsil and aggregate
-            summary_table = latest_snapshot_clean.copy()
-            
-            # Group by Tehsil/Sub Tehsil and sum all numeric columns
-            group_cols = ["Tehsil/Sub Tehsil"]
-            agg_dict = {}
-            
-            # Sum all pendency columns
-            for col in available_pendency_cols:
-                agg_dict[col] = 'sum'
-            agg_dict["Total"] = 'sum'
-            
-            # Group and aggregate
-            summary_table = summary_table.groupby(group_cols, as_index=False).agg(agg_dict)
-            
-            # Ensure all numeric columns are properly typed
-            for col in available_pendency_cols + ["Total"]:
-                summary_table[col] = pd.to_numeric(summary_table[col], errors="coerce").fillna(0).astype(float)
+            # Tehsil-level sums come precomputed (as floats) with the other cached aggregates;
+            # st.cache_data hands back a fresh copy, so the columns added below stay local
+            summary_table = aggregates["tehsil_totals"]
             
             # Recalculate total_latest for tehsil-level view
-            tehsil_total_latest = float(summary_table["Total"].sum())
+            tehsil_total_values = summary_table["Total"].to_numpy()
+            tehsil_total_latest = float(tehsil_total_values.sum())
             
             # Add percentage column based on tehsil-level total
-            summary_table["% of Total"] = (summary_table["Total"] / tehsil_total_latest * 100).round(2) if tehsil_total_latest > 0 else 0
-            
-            # Add rank
-            summary_table["Rank"] = summary_table["Total"].rank(ascending=False, method="dense").astype(int)
+            summary_table["% of Total"] = np.round(tehsil_total_values / tehsil_total_latest * 100, 2) if tehsil_total_latest > 0 else 0
             
-            # Add alert indicator
-            summary_table["Alert"] = summary_table["Total"].apply(lambda x: "⚠️" if x > threshold else "✅")
+            # Add rank and alert indicator
+            tehsil_rank, tehsil_alert = rank_and_alert(tehsil_total_values, threshold)
+            summary_table["Rank"] = tehsil_rank
+            summary_table["Alert"] = np.where(tehsil_alert, "⚠️", "✅")
             
             # Select and order columns for display (no Officer column for tehsil view)
             display_cols = []
@@ -2071,62 +1685,51 @@ else:
             display_cols.extend(["Total", "% of Total", "Alert"])
             
             # Create final table
-            final_table = summary_table[display_cols].copy()
+            final_table = summary_table[display_cols]
             
-            # Sort by Total descending (before formatting)
-            final_table = final_table.sort_values("Total", ascending=False).reset_index(drop=True)
+            # Sort by Total descending (before formatting); the sort already returns a fresh frame
+            final_table = final_table.sort_values("Total", ascending=False, ignore_index=True)
             
             # Update total for display
             display_total = tehsil_total_latest
         else:
             # Officer Level view (original logic)
-            summary_table = latest_snapshot_clean.copy()
-            
-            # Add percentage column - use total_latest from grouped data
-            summary_table["% of Total"] = (summary_table["Total"] / total_latest * 100).round(2)
-            
-            # Add rank if not present
-            if "Rank" not in summary_table.columns:
-                summary_table["Rank"] = summary_table["Total"].rank(ascending=False, method="dense").astype(int)
-            
-            # Add alert indicator
-            summary_table["Alert"] = summary_table["Total"].apply(lambda x: "⚠️" if x > threshold else "✅")
-            
             # Select and order columns for display
             display_cols = []
             
-            # Core identification columns
-            if "Rank" in summary_table.columns:
+            # Core identification columns (Rank is added below when not present)
+            if "Rank" in latest_snapshot.columns:
                 display_cols.append("Rank")
-            if "Tehsil/Sub Tehsil" in summary_table.columns:
+            if "Tehsil/Sub Tehsil" in latest_snapshot.columns:
                 display_cols.append("Tehsil/Sub Tehsil")
             display_cols.append("Officer")
             
             # Add all pendency type columns
             for col in available_pendency_cols:
                 display_cols.append(col)
+            display_cols.append("Total")
             
-            # Add summary columns
-            display_cols.extend(["Total", "% of Total", "Alert"])
-            
-            # Create final table
-            final_table = summary_table[display_cols].copy()
+            # Create final table: the column selection is the only copy of the shared snapshot,
+            # sorted by Total descending (before formatting) so the columns below line up with it
+            final_table = latest_snapshot[display_cols].sort_values("Total", ascending=False, ignore_index=True)
+            officer_total_values = final_table["Total"].to_numpy()
             
-            # Sort by Total descending (before formatting)
-            final_table = final_table.sort_values("Total", ascending=False).reset_index(drop=True)
+            # Add rank if not present, percentage (of total_latest from grouped data) and alert indicator
+            officer_rank, officer_alert = rank_and_alert(officer_total_values, threshold)
+            if "Rank" not in final_table.columns:
+                final_table.insert(0, "Rank", officer_rank)
+            final_table["% of Total"] = np.round(officer_total_values / total_latest * 100, 2) if total_latest > 0 else 0
+            final_table["Alert"] = np.where(officer_alert, "⚠️", "✅")
             
             # Update total for display
             display_total = total_latest
         
-        # Format numeric columns for display
-        final_table_display = final_table.copy()
-        for col in available_pendency_cols + ["Total"]:
-            if col in final_table_display.columns:
-                final_table_display[col] = final_table_display[col].apply(format_number)
-        
-        # Format percentage
-        if "% of Total" in final_table_display.columns:
-            final_table_display["% of Total"] = final_table_display["% of Total"].apply(lambda x: f"{x:.2f}%")
+        # Keep numeric columns numeric: the grid formats them client-side and sorts them as numbers.
+        # Tehsil sums arrive as floats, so counts go out as plain integers (final_table is private, no copy needed)
+        final_table_display = final_table
+        count_cols = [col for col in available_pendency_cols + ["Total"] if col in final_table_display.columns]
+        for col in count_cols:
+            final_table_display[col] = final_table_display[col].to_numpy().astype(np.int64)
         
         # Create abbreviated column names for better fit
         column_abbreviations = {
@@ -2148,57 +1751,20 @@ else:
         view_type = "Tehsils" if view_option == "Tehsil Level" else "Records"
         st.markdown(f"**Total {view_type}:** {len(final_table_display_renamed)} | **Date:** {latest_date.strftime('%B %d, %Y') if pd.notna(latest_date) else 'Latest'}")
         
-        # Add CSS for responsive table with horizontal scroll if needed
-        st.markdown("""
-        <style>
-        /* Make table container fit viewport width */
-        .stDataFrame {
-            width: 100% !important;
-            max-width: 100% !important;
-        }
-        /* Style the dataframe to be more compact */
-        div[data-testid="stDataFrame"] {
-            overflow-x: auto;
-            overflow-y: auto;
-            max-width: 100%;
-        }
-        /* Make table cells more compact */
-        div[data-testid="stDataFrame"] table {
-            font-size: 0.85rem !important;
-            width: 100% !important;
-            table-layout: auto !important;
-        }
-        /* Compact column headers */
-        div[data-testid="stDataFrame"] th {
-            padding: 0.5rem 0.4rem !important;
-            font-size: 0.8rem !important;
-            white-space: nowrap;
-        }
-        /* Compact table cells */
-        div[data-testid="stDataFrame"] td {
-            padding: 0.4rem 0.3rem !important;
-            font-size: 0.8rem !important;
-            white-space: nowrap;
-        }
-        /* Ensure numeric columns are right-aligned for better readability */
-        div[data-testid="stDataFrame"] td:nth-child(n+2) {
-            text-align: right;
-        }
-        /* Rank and Alert columns can be centered */
-        div[data-testid="stDataFrame"] td:first-child,
-        div[data-testid="stDataFrame"] td:last-child {
-            text-align: center;
+        # Comma-grouped counts and a 2-decimal percentage, formatted by the grid itself
+        table_column_config = {
+            column_abbreviations.get(col, col): st.column_config.NumberColumn(format="localized")
+            for col in count_cols
         }
-        </style>
-        """, unsafe_allow_html=True)
+        table_column_config[column_abbreviations["% of Total"]] = st.column_config.NumberColumn(format="%.2f%%")
         
         # Display table with search and sort
         st.dataframe(
             final_table_display_renamed,
-                width='stretch',
+            width='stretch',
             hide_index=True,
             height=400,
-            use_container_width=True
+            column_config=table_column_config
         )
     else:
         st.info("No data available for the summary table.")
@@ -23,6 +23,8 @@ import time
 import logging
 import os
 from io import BytesIO
+from xlsx_probe import xlsx_header_probe
+from excel_utils import EXCEL_ENGINE, normalize_key_columns, read_excel_with_fallback
 
 # Try to import Google Drive storage
 try:
@@ -132,18 +134,22 @@ def validate_excel_file(file) -> tuple[bool, str]:
         if file.size > 50 * 1024 * 1024:
             return False, "File size must be less than 50MB"
         
-        # Try to read the file
+        # Try to read the file: probe the xlsx header directly, falling back to a one-row read
         try:
-            df = pd.read_excel(file, engine="openpyxl", nrows=1)
-            if df.empty:
+            try:
+                columns, has_data = xlsx_header_probe(file.getvalue())
+            except Exception:
+                df = pd.read_excel(file, engine=EXCEL_ENGINE, nrows=1)
+                columns, has_data = list(df.columns), not df.empty
+            if not has_data:
                 return False, "File appears to be empty"
             
             # Check for required columns
             required_cols = ["Sub Division", "Officer"]
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = [col for col in required_cols if col not in columns]
             if missing_cols:
                 # Try case-insensitive match
-                df_cols_lower = {c.lower().strip(): c for c in df.columns}
+                df_cols_lower = {str(c).lower().strip(): c for c in columns}
                 missing_cols = [col for col in required_cols if col.lower() not in df_cols_lower]
                 if missing_cols:
                     return False, f"File missing required columns: {', '.join(missing_cols)}"
@@ -187,12 +193,7 @@ def _load_all_files_core() -> pd.DataFrame:
                         continue
                     
                     # Read Excel file from bytes
-                    try:
-                        df = pd.read_excel(file_data, engine="openpyxl")
-                    except Exception as e:
-                        logger.warning(f"Failed to read {filename} with default sheet, trying first sheet: {e}")
-                        file_data.seek(0)
-                        df = pd.read_excel(file_data, sheet_name=0, engine="openpyxl")
+                    df = read_excel_with_fallback(file_data, label=filename)
                     
                     if df.empty:
                         logger.warning(f"File {filename} is empty, skipping")
@@ -224,11 +225,7 @@ def _load_all_files_core() -> pd.DataFrame:
                     continue
                 
                 try:
-                    try:
-                        df = pd.read_excel(f, engine="openpyxl")
-                    except Exception as e:
-                        logger.warning(f"Failed to read {f.name} with default sheet, trying first sheet: {e}")
-                        df = pd.read_excel(f, sheet_name=0, engine="openpyxl")
+                    df = read_excel_with_fallback(f)
                     
                     if df.empty:
                         logger.warning(f"File {f.name} is empty, skipping")
@@ -252,19 +249,8 @@ def _load_all_files_core() -> pd.DataFrame:
         for df, filename in files_data:
             try:
                 # Normalize column names
-                df_cols = {c.lower().strip(): c for c in df.columns}
-                
-                # Try to find and rename Total column
-                if "total" not in df_cols:
-                    match = [c for c in df.columns if "total" in str(c).lower()]
-                    if match:
-                        df.rename(columns={match[0]: "Total"}, inplace=True)
-                
-                # Try to find and rename Sub Division column
-                if "sub division" not in df_cols:
-                    match = [c for c in df.columns if "sub" in str(c).lower() and "division" in str(c).lower()]
-                    if match:
-                        df.rename(columns={match[0]: "Sub Division"}, inplace=True)
+                # Map fuzzy Total / Sub Division headers onto the canonical names
+                df = normalize_key_columns(df)
                 
                 # Validate dataframe
                 is_valid, error_msg = validate_dataframe(df, filename)
@@ -0,0 +1,50 @@
+"""
+Excel Utilities Module
+Helpers shared by the dashboard entry scripts for reading FCR workbooks
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Prefer the Rust-based calamine Excel parser when it is installed
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+EXCEL_ENGINE = "calamine" if CALAMINE_AVAILABLE else "openpyxl"  # openpyxl stays the fallback reader
+
+
+def normalize_key_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename fuzzy Total / Sub Division headers in one vectorized pass over the lowercased column names"""
+    norm = df.columns.astype(str).str.lower()
+    renames = {}
+    if not (norm.str.strip() == "total").any():
+        hits = np.flatnonzero(norm.str.contains("total", regex=False))
+        if len(hits):
+            renames[df.columns[hits[0]]] = "Total"
+    if not (norm.str.strip() == "sub division").any():
+        hits = [i for i in np.flatnonzero(norm.str.contains("sub", regex=False) & norm.str.contains("division", regex=False))
+                if df.columns[i] not in renames]
+        if hits:
+            renames[df.columns[hits[0]]] = "Sub Division"
+    return df.rename(columns=renames) if renames else df
+
+
+def read_excel_with_fallback(source, label: str = None, **kwargs) -> pd.DataFrame:
+    """pd.read_excel with EXCEL_ENGINE; if calamine fails, log it and retry once with openpyxl.
+    sheet_name already defaults to the first sheet, so only a different engine is worth a retry."""
+    try:
+        return pd.read_excel(source, engine=EXCEL_ENGINE, **kwargs)
+    except Exception as e:
+        if EXCEL_ENGINE == "openpyxl":
+            raise
+        logger.warning(f"Failed to read {label or getattr(source, 'name', 'workbook')} with {EXCEL_ENGINE}, retrying with openpyxl: {e}")
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_excel(source, engine="openpyxl", **kwargs)
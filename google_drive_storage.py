@@ -8,6 +8,7 @@ import logging
 from typing import List, Optional
 from io import BytesIO
 import json
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -95,7 +96,9 @@ class GoogleDriveStorage:
                 scopes=['https://www.googleapis.com/auth/drive']
             )
             
+            self.credentials = credentials
             self.drive_service = build('drive', 'v3', credentials=credentials)
+            self._local = threading.local()
             self.MediaIoBaseDownload = MediaIoBaseDownload
             self.MediaIoBaseUpload = MediaIoBaseUpload
             self.HttpError = HttpError
@@ -110,11 +113,21 @@ class GoogleDriveStorage:
             logger.error(f"❌ Error initializing Google Drive API: {e}")
             raise
     
+    def _get_thread_http(self):
+        """Return an authorized HTTP client for the current thread (httplib2 is not thread-safe)"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import httplib2
+            import google_auth_httplib2
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+    
     def list_files(self) -> List[dict]:
         """List all Excel files in the Google Drive folder"""
         try:
             # Query files in the folder
-            query = f"'{self.folder_id}' in parents and (mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' or mimeType='application/vnd.ms-excel') and trashed=false"
+            query = f"'{self.folder_id}' in parents and (mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' or mimeType='application/vnd.ms-excel' or mimeType='application/vnd.ms-excel.sheet.binary.macroEnabled.12') and trashed=false"
             
             results = self.drive_service.files().list(
                 q=query,
@@ -137,15 +150,10 @@ class GoogleDriveStorage:
         """Download file from Google Drive by file ID"""
         try:
             request = self.drive_service.files().get_media(fileId=file_id)
-            file_data = BytesIO()
-            downloader = self.MediaIoBaseDownload(file_data, request)
-            
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-            
-            file_data.seek(0)
-            return file_data
+            # Daily workbooks are small, so fetch the media in one request instead of a chunked download.
+            # Downloads may run concurrently, so each thread uses its own HTTP client.
+            content = request.execute(http=self._get_thread_http())
+            return BytesIO(content)
             
         except self.HttpError as e:
             logger.error(f"Error downloading file {file_id} from Google Drive: {e}")
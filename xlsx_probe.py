@@ -0,0 +1,77 @@
+"""
+Excel Header Probe Module
+Reads the header row of an .xlsx workbook without parsing the whole sheet
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+
+def _local(tag: str) -> str:
+    """XML tag name without its namespace"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _joined_text(el) -> str:
+    """All <t> text under an element, so rich-text strings split into several runs come back whole"""
+    return "".join(t.text or "" for t in el.iter() if _local(t.tag) == "t")
+
+
+def xlsx_header_probe(data: bytes):
+    """Read only the header row of an .xlsx workbook's first sheet straight from the zip.
+    Returns (column names, has data row); raises on anything that is not a readable xlsx or whose row 1 is empty."""
+    with zipfile.ZipFile(BytesIO(data)) as zf:
+        # Resolve the first sheet in workbook order (not necessarily sheet1.xml)
+        first_sheet = next(el for el in ET.fromstring(zf.read("xl/workbook.xml")).iter() if _local(el.tag) == "sheet")
+        rel_id = next(v for k, v in first_sheet.attrib.items() if _local(k) == "id")
+        target = next(
+            el.get("Target") for el in ET.fromstring(zf.read("xl/_rels/workbook.xml.rels")).iter()
+            if _local(el.tag) == "Relationship" and el.get("Id") == rel_id
+        )
+        sheet_path = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+        # Stream the sheet and stop as soon as the header row and the start of a second row are seen.
+        # Header cells are (type, value): inline strings carry their joined text, everything else its <v>
+        header, has_data = [], False
+        rows_seen = 0
+        with zf.open(sheet_path) as sheet:
+            for _, el in ET.iterparse(sheet, events=("end",)):
+                name = _local(el.tag)
+                if name == "c" and rows_seen == 0:
+                    if el.get("t") == "inlineStr":
+                        header.append(("inlineStr", _joined_text(el)))
+                    else:
+                        value = next((child for child in el.iter() if _local(child.tag) == "v"), None)
+                        header.append((el.get("t"), value.text if value is not None else None))
+                elif name == "c" and any(_local(child.tag) in ("v", "t") for child in el.iter()):
+                    has_data = True
+                    break
+                elif name == "row":
+                    if rows_seen == 0:
+                        header_row = el.get("r", "1")
+                    rows_seen += 1
+                    el.clear()
+
+        # pd.read_excel always takes sheet row 1 as the header, even when it is blank or formatting-only.
+        # Leave those sheets (and ones whose first stored row is further down) to the one-row read fallback
+        if rows_seen == 0 or header_row != "1" or not any(v for _, v in header):
+            raise ValueError("First sheet has no header in row 1")
+
+        # Resolve shared-string header cells, reading sharedStrings.xml only up to the highest index needed
+        wanted = {int(v) for t, v in header if t == "s" and v is not None}
+        shared = {}
+        if wanted:
+            with zf.open("xl/sharedStrings.xml") as strings:
+                index = 0
+                for _, el in ET.iterparse(strings, events=("end",)):
+                    if _local(el.tag) == "si":
+                        if index in wanted:
+                            shared[index] = _joined_text(el)
+                        index += 1
+                        el.clear()
+                        if index > max(wanted):
+                            break
+
+    columns = [shared.get(int(v), "") if t == "s" and v is not None else (v or "") for t, v in header]
+    return columns, has_data